@@ -237,4 +237,5 @@ app.on("will-quit", () => {
   globalShortcut.unregisterAll();
   globeKeyManager.stop();
   updateManager.cleanup();
+  whisperManager.stopWhisperDaemon();
 });
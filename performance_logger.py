@@ -8,8 +8,16 @@ import time
 import json
 import os
 import sys
+import threading
+import contextlib
+import math
+import atexit
+import gzip
+import re
+import shutil
+from collections import deque
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Iterable, Iterator
 
 class PerformanceLogger:
     """Logger for tracking performance metrics of audio transcription pipeline"""
@@ -26,23 +34,43 @@ class PerformanceLogger:
         self.log_file = log_file or "performance_logs.jsonl"
         self.current_session = {}
         self.session_start = None
+        self._lock = threading.Lock()
+        self._next_span_id = 0
 
-    def start_session(self, audio_file: str) -> None:
+    def start_session(self, audio_file: str, file_size_bytes: Optional[int] = None,
+                      model: Optional[str] = None, provider: Optional[str] = None,
+                      kind: str = "transcription") -> None:
         """
         Start a new performance tracking session.
 
         Args:
-            audio_file: Path to the audio file being processed
+            audio_file: Path to the audio file being processed (or a label for in-memory audio)
+            file_size_bytes: Size of the audio payload, when it is not read from audio_file
+            model: Model doing the work, for grouping in analyze_logs
+            provider: Where it runs ("local", "groq", ...), for grouping in analyze_logs
+            kind: Operation being timed ("transcription", "stream", "download", "warmup");
+                analyze_logs only reports transcriptions unless asked otherwise
         """
-        self.session_start = time.time()
-        file_size = os.path.getsize(audio_file) if os.path.exists(audio_file) else 0
+        self.session_start = time.perf_counter_ns()
+        self._next_span_id = 0
+        if file_size_bytes is not None:
+            file_size = file_size_bytes
+        else:
+            file_size = os.path.getsize(audio_file) if os.path.exists(audio_file) else 0
 
         self.current_session = {
             "timestamp": datetime.now().isoformat(),
+            "kind": kind,
             "audio_file": os.path.basename(audio_file),
             "file_size_bytes": file_size,
             "file_size_mb": round(file_size / (1024 * 1024), 2),
+            "model": model,
+            "provider": provider,
+            "audio_duration_s": None,
+            "sample_rate": None,
+            "channels": None,
             "steps": {},
+            "spans": [],
             "total_time_ms": 0
         }
 
@@ -53,24 +81,96 @@ class PerformanceLogger:
             print(f"   Size: {self.current_session['file_size_mb']} MB ({file_size:,} bytes)", file=sys.stderr)
             print(f"{'='*60}", file=sys.stderr)
 
+    def set_audio_info(self, duration_s: Optional[float] = None, sample_rate: Optional[int] = None,
+                       channels: Optional[int] = None) -> None:
+        """
+        Record what the session's audio contains; values left as None are kept.
+
+        Args:
+            duration_s: Decoded audio duration in seconds (the basis for real-time factor)
+            sample_rate: Sample rate of the audio as received
+            channels: Channel count of the audio as received
+        """
+        for field, value in (("audio_duration_s", duration_s), ("sample_rate", sample_rate),
+                             ("channels", channels)):
+            if value is not None:
+                self.current_session[field] = round(value, 3) if field == "audio_duration_s" else value
+
+    def set_session_info(self, **fields) -> None:
+        """Update session fields that are only known once processing starts (e.g. model, provider)"""
+        self.current_session.update(fields)
+
     def log_step(self, step_name: str, duration_ms: float, **metadata) -> None:
         """
         Log a processing step with its duration.
 
+        The step ends now and is nested under the StepTimer active on this
+        thread, if any.
+
         Args:
             step_name: Name of the processing step
             duration_ms: Duration in milliseconds
             **metadata: Additional metadata to log
         """
-        step_data = {
+        end_ns = time.perf_counter_ns()
+        parent = _active_timer(self)
+        self._record_span(step_name, end_ns - int(duration_ms * 1_000_000), end_ns, None,
+                          parent.span_id if parent else None, metadata)
+
+    def _allocate_span_id(self) -> int:
+        with self._lock:
+            self._next_span_id += 1
+            return self._next_span_id
+
+    def _record_span(self, step_name: str, start_ns: int, end_ns: int, cpu_ns: Optional[int],
+                     parent_id: Optional[int], metadata: Dict[str, Any],
+                     span_id: Optional[int] = None, thread_id: Optional[int] = None,
+                     thread_name: Optional[str] = None) -> None:
+        """Append a span and fold it into the per-name step aggregate"""
+        if span_id is None:
+            span_id = self._allocate_span_id()
+        duration_ms = (end_ns - start_ns) / 1_000_000
+        cpu_ms = round(cpu_ns / 1_000_000, 2) if cpu_ns is not None else None
+        if thread_id is None:
+            thread = threading.current_thread()
+            thread_id, thread_name = thread.ident, thread.name
+        span = {
+            "id": span_id,
+            "parent_id": parent_id,
+            "name": step_name,
+            "start_ms": round((start_ns - (self.session_start or start_ns)) / 1_000_000, 3),
             "duration_ms": round(duration_ms, 2),
-            **metadata
+            "cpu_ms": cpu_ms,
+            "thread_id": thread_id,
+            "thread_name": thread_name,
+            "metadata": metadata
         }
 
-        self.current_session["steps"][step_name] = step_data
+        with self._lock:
+            if "spans" not in self.current_session:
+                return
+            self.current_session["spans"].append(span)
+            # "steps" keeps one entry per top-level name, so percentages, RTF and
+            # totals never count a child's time twice; repeated steps add up.
+            # Child spans are only kept in "spans".
+            if parent_id is None:
+                step_data = self.current_session["steps"].get(step_name)
+                if step_data is None:
+                    step_data = {"duration_ms": round(duration_ms, 2)}
+                    if cpu_ms is not None:
+                        step_data["cpu_ms"] = cpu_ms
+                    step_data.update(metadata)
+                    self.current_session["steps"][step_name] = step_data
+                else:
+                    step_data.update(metadata)
+                    step_data["duration_ms"] = round(step_data["duration_ms"] + duration_ms, 2)
+                    if cpu_ms is not None:
+                        step_data["cpu_ms"] = round(step_data.get("cpu_ms", 0) + cpu_ms, 2)
+                    step_data["count"] = step_data.get("count", 1) + 1
 
         if self.console_output:
-            print(f">   {step_name}: {duration_ms:.0f}ms", end="", file=sys.stderr)
+            depth = sum(1 for timer in getattr(_timer_stack, "timers", []) if timer.logger is self)
+            print(f">   {'  ' * depth}{step_name}: {duration_ms:.0f}ms", end="", file=sys.stderr)
             if metadata:
                 meta_str = ", ".join(f"{k}={v}" for k, v in metadata.items())
                 print(f" ({meta_str})", end="", file=sys.stderr)
@@ -88,7 +188,7 @@ class PerformanceLogger:
             Dictionary containing all session metrics
         """
         if self.session_start:
-            total_time = (time.time() - self.session_start) * 1000
+            total_time = (time.perf_counter_ns() - self.session_start) / 1_000_000
             self.current_session["total_time_ms"] = round(total_time, 2)
 
         self.current_session["success"] = success
@@ -102,6 +202,16 @@ class PerformanceLogger:
                 percentage = (step_data["duration_ms"] / self.current_session["total_time_ms"]) * 100
                 self.current_session["breakdown_percent"][step_name] = round(percentage, 1)
 
+        # Real-time factor: processing seconds per second of audio (below 1 is faster than real time)
+        audio_duration_s = self.current_session.get("audio_duration_s")
+        if audio_duration_s:
+            audio_ms = audio_duration_s * 1000
+            self.current_session["rtf"] = round(self.current_session["total_time_ms"] / audio_ms, 4)
+            self.current_session["step_rtf"] = {
+                step_name: round(step_data["duration_ms"] / audio_ms, 4)
+                for step_name, step_data in self.current_session["steps"].items()
+            }
+
         # Write to log file
         self._write_to_file()
 
@@ -120,6 +230,9 @@ class PerformanceLogger:
         # File info
         print(f"File: {self.current_session['audio_file']}", file=sys.stderr)
         print(f"Size: {self.current_session['file_size_mb']} MB", file=sys.stderr)
+        if self.current_session.get("rtf") is not None:
+            print(f"Audio: {self.current_session['audio_duration_s']:.1f}s "
+                  f"(RTF {self.current_session['rtf']:.3f})", file=sys.stderr)
         print(f"Status: {'✅ Success' if self.current_session.get('success', False) else '❌ Failed'}", file=sys.stderr)
 
         if self.current_session.get('error'):
@@ -142,135 +255,776 @@ class PerformanceLogger:
 
         print(f"{'-'*50}", file=sys.stderr)
         print(f"{'TOTAL':<30} {self.current_session['total_time_ms']:>8.0f}ms   100.0%", file=sys.stderr)
+
+        spans = self.current_session.get("spans", [])
+        if any(span["parent_id"] is not None for span in spans):
+            print(f"\n{'Span Tree:':<30} {'Wall':<12} {'CPU':<10} {'Count':<6}", file=sys.stderr)
+            print(f"{'-'*60}", file=sys.stderr)
+            for path, totals in span_tree(spans).items():
+                label = "  " * (len(path) - 1) + path[-1]
+                cpu = f"{totals['cpu_ms']:>6.0f}ms" if totals["cpu_ms"] is not None else f"{'-':>8}"
+                print(f"{label:<30} {totals['duration_ms']:>8.0f}ms   {cpu}   {totals['count']:>5}",
+                      file=sys.stderr)
+
         print(f"{'='*60}\n", file=sys.stderr)
 
     def _write_to_file(self) -> None:
-        """Write session data to log file in JSON Lines format"""
+        """Append session data to the log file in JSON Lines format (see LogWriter)"""
         try:
-            # Ensure directory exists
-            log_dir = os.path.dirname(self.log_file)
-            if log_dir and not os.path.exists(log_dir):
-                os.makedirs(log_dir, exist_ok=True)
-
-            # Append to file
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(self.current_session) + '\\n')
+            get_log_writer(self.log_file).write(self.current_session)
         except Exception as e:
             if self.console_output:
                 print(f"Warning: Failed to write to log file: {e}", file=sys.stderr)
 
 
+# Rotation and buffering defaults for performance log files
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_MAX_AGE_S = 24 * 60 * 60
+DEFAULT_LOG_BACKUP_COUNT = 20
+
+
+class LogWriter:
+    """
+    Append-only JSON Lines writer with batching and rotation.
+
+    Records are buffered until batch_size of them are pending or
+    flush_interval_s has passed, then appended with a single write on a
+    file handle that stays open. When the file exceeds max_bytes or its
+    segment is older than max_age_s, it is renamed to
+    <log_file>.<timestamp> and gzip-compressed in the background; at most
+    backup_count compressed segments are kept.
+    """
+
+    def __init__(self, log_file: str, batch_size: int = 1, flush_interval_s: float = 5.0,
+                 max_bytes: int = DEFAULT_LOG_MAX_BYTES, max_age_s: float = DEFAULT_LOG_MAX_AGE_S,
+                 backup_count: int = DEFAULT_LOG_BACKUP_COUNT):
+        self.log_file = log_file
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.backup_count = backup_count
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._file = None
+        self._segment_started = None
+        self._timer = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+
+        data = ''.join(self._buffer).encode('utf-8')
+        self._buffer = []
+        self._open_locked()
+        if self._should_rotate(len(data)):
+            self._rotate_locked()
+            self._open_locked()
+        # One write per batch, so appends from other processes never interleave mid-line
+        self._file.write(data)
+        self._file.flush()
+
+    def _open_locked(self) -> None:
+        if self._file is not None:
+            # Reopen if another process rotated the file away underneath us
+            try:
+                if os.stat(self.log_file).st_ino == os.fstat(self._file.fileno()).st_ino:
+                    return
+            except OSError:
+                pass
+            self._file.close()
+
+        log_dir = os.path.dirname(self.log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        self._file = open(self.log_file, 'ab', buffering=0)
+        self._segment_started = self._first_record_time()
+
+    def _first_record_time(self) -> float:
+        """When the live segment was started, from the timestamp of its first session"""
+        try:
+            with open(self.log_file, 'rb') as f:
+                head = f.read(4096).decode('utf-8', errors='ignore')
+            match = re.search(r'"timestamp": "([^"]+)"', head)
+            if match:
+                return datetime.fromisoformat(match.group(1)).timestamp()
+        except (OSError, ValueError):
+            pass
+        return time.time()
+
+    def _should_rotate(self, incoming: int) -> bool:
+        size = self._file.tell()
+        if not size:
+            return False
+        return (size + incoming > self.max_bytes or
+                time.time() - self._segment_started > self.max_age_s)
+
+    def _rotate_locked(self) -> None:
+        self._file.close()
+        self._file = None
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        segment = f"{self.log_file}.{stamp}"
+        suffix = 1
+        while os.path.exists(segment) or os.path.exists(segment + '.gz'):
+            segment = f"{self.log_file}.{stamp}-{suffix}"
+            suffix += 1
+        try:
+            os.replace(self.log_file, segment)
+        except OSError:
+            return
+        threading.Thread(target=self._compress, args=(segment,), name="log-compress", daemon=True).start()
+
+    def _compress(self, segment: str) -> None:
+        """gzip a rotated segment next to itself and drop segments beyond backup_count"""
+        try:
+            with open(segment, 'rb') as source, gzip.open(segment + '.gz.tmp', 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.replace(segment + '.gz.tmp', segment + '.gz')
+            os.remove(segment)
+            rotated = [path for path in log_segments(self.log_file) if path != self.log_file]
+            for old in rotated[:max(0, len(rotated) - self.backup_count)]:
+                os.remove(old)
+        except OSError:
+            pass
+
+
+_log_writers: Dict[str, LogWriter] = {}
+_log_writer_settings: Dict[str, Any] = {}
+_log_writers_lock = threading.Lock()
+
+
+def get_log_writer(log_file: str) -> LogWriter:
+    """Return the process-wide writer for a log file, so every logger shares one handle and buffer"""
+    path = os.path.abspath(log_file)
+    with _log_writers_lock:
+        if path not in _log_writers:
+            _log_writers[path] = LogWriter(log_file, **_log_writer_settings)
+        return _log_writers[path]
+
+
+def configure_log_writers(**settings) -> None:
+    """
+    Change LogWriter settings (batch_size, flush_interval_s, max_bytes,
+    max_age_s, backup_count) for current and future writers.
+
+    Long-running processes such as the transcription daemon or batch mode
+    raise batch_size so sessions are appended in groups instead of one
+    write per session.
+    """
+    with _log_writers_lock:
+        _log_writer_settings.update(settings)
+        writers = list(_log_writers.values())
+    for writer in writers:
+        with writer._lock:
+            for name, value in settings.items():
+                setattr(writer, name, value)
+
+
+def flush_log_writers() -> None:
+    """Write out every buffered record"""
+    with _log_writers_lock:
+        writers = list(_log_writers.values())
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(flush_log_writers)
+
+
+def log_segments(log_file: str) -> List[str]:
+    """
+    Return the files holding a log, oldest first: rotated segments, then the live file.
+
+    A segment that exists both compressed and uncompressed is mid-compression;
+    the .gz copy is complete (it is published with os.replace), so it wins.
+    """
+    directory = os.path.dirname(log_file) or '.'
+    prefix = os.path.basename(log_file) + '.'
+    rotated = {}
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = []
+    for name in names:
+        if not name.startswith(prefix) or name.endswith('.tmp'):
+            continue
+        stem = name[:-3] if name.endswith('.gz') else name
+        if name.endswith('.gz') or stem not in rotated:
+            rotated[stem] = os.path.join(directory, name)
+
+    segments = [rotated[stem] for stem in sorted(rotated)]
+    if os.path.exists(log_file):
+        segments.append(log_file)
+    return segments
+
+
+# StepTimers currently open on each thread, innermost last
+_timer_stack = threading.local()
+
+
+def _active_timer(logger: Optional[PerformanceLogger] = None) -> Optional["StepTimer"]:
+    """Return the innermost open StepTimer on this thread (for logger, if given)"""
+    for timer in reversed(getattr(_timer_stack, "timers", [])):
+        if logger is None or timer.logger is logger:
+            return timer
+    return None
+
+
+def span_tree(spans: List[Dict[str, Any]]) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Aggregate spans by their path of names from the root.
+
+    Args:
+        spans: Span dictionaries from a session's "spans" list
+
+    Returns:
+        Ordered mapping of name paths (root first) to duration, CPU time and count
+    """
+    by_id = {span["id"]: span for span in spans}
+    paths = {}
+
+    def path_of(span):
+        if span["id"] not in paths:
+            parent = by_id.get(span["parent_id"])
+            paths[span["id"]] = (path_of(parent) if parent else ()) + (span["name"],)
+        return paths[span["id"]]
+
+    tree = {}
+    for span in sorted(spans, key=lambda s: s["start_ms"]):
+        path = path_of(span)
+        totals = tree.setdefault(path, {"duration_ms": 0.0, "cpu_ms": None, "count": 0})
+        totals["duration_ms"] = round(totals["duration_ms"] + span["duration_ms"], 2)
+        if span.get("cpu_ms") is not None:
+            totals["cpu_ms"] = round((totals["cpu_ms"] or 0) + span["cpu_ms"], 2)
+        totals["count"] += 1
+
+    # Children directly after their parent, in order of first appearance
+    order = list(tree)
+    return {path: tree[path] for path in sorted(order, key=lambda p: [order.index(p[:i + 1]) for i in range(len(p))])}
+
+
 class StepTimer:
-    """Context manager for timing individual steps"""
+    """
+    Context manager for timing individual steps.
 
-    def __init__(self, logger: PerformanceLogger, step_name: str, **metadata):
+    StepTimers opened inside another one on the same thread are recorded as
+    its child spans; work on another thread can name its parent explicitly.
+    Wall time uses perf_counter_ns; CPU time is process-wide so it includes
+    inference library threads working on the step.
+    """
+
+    def __init__(self, logger: PerformanceLogger, step_name: str,
+                 parent: Optional["StepTimer"] = None, **metadata):
         """
         Initialize step timer.
 
         Args:
             logger: PerformanceLogger instance
             step_name: Name of the step being timed
+            parent: Open StepTimer to nest under (default: the innermost one on this thread)
             **metadata: Additional metadata to log
         """
         self.logger = logger
         self.step_name = step_name
         self.metadata = metadata
         self.start_time = None
+        self.span_id = None
+        self.parent = parent
+        self.parent_id = None
+        self._cpu_start = None
 
     def __enter__(self):
-        self.start_time = time.time()
+        parent = self.parent or _active_timer(self.logger)
+        self.parent_id = parent.span_id if parent else None
+        self.span_id = self.logger._allocate_span_id()
+        if not hasattr(_timer_stack, "timers"):
+            _timer_stack.timers = []
+        _timer_stack.timers.append(self)
+        self._cpu_start = time.process_time_ns()
+        self.start_time = time.perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration_ms = (time.time() - self.start_time) * 1000
-        self.logger.log_step(self.step_name, duration_ms, **self.metadata)
+        end_ns = time.perf_counter_ns()
+        cpu_ns = time.process_time_ns() - self._cpu_start
+        _timer_stack.timers.remove(self)
+        self.logger._record_span(self.step_name, self.start_time, end_ns, cpu_ns,
+                                 self.parent_id, self.metadata, span_id=self.span_id)
         return False  # Don't suppress exceptions
 
 
+def child_timer(step_name: str, **metadata):
+    """
+    Time a step as a child of the StepTimer open on this thread.
+
+    Lets code that has no logger of its own (e.g. model internals) add detail
+    under the caller's current step. Without an open StepTimer nothing is
+    recorded.
+    """
+    parent = _active_timer()
+    if parent is None:
+        return contextlib.nullcontext()
+    return StepTimer(parent.logger, step_name, **metadata)
+
+
+def record_child_span(step_name: str, start_ns: int, end_ns: int, cpu_ns: Optional[int] = None,
+                      thread_id: Optional[int] = None, thread_name: Optional[str] = None,
+                      **metadata) -> None:
+    """
+    Record a span timed elsewhere (e.g. in a worker process) under the open StepTimer.
+
+    start_ns and end_ns must come from time.perf_counter_ns(), which is a
+    system-wide monotonic clock, so readings from other processes on the
+    same machine line up with this one.
+    """
+    parent = _active_timer()
+    if parent is None:
+        return
+    parent.logger._record_span(step_name, start_ns, end_ns, cpu_ns, parent.span_id, metadata,
+                               thread_id=thread_id, thread_name=thread_name)
+
+
+# File size buckets for group_by="size", as (upper bound in MB, label)
+FILE_SIZE_BUCKETS = [(0.1, "<100 KB"), (1, "100 KB-1 MB"), (10, "1-10 MB"), (100, "10-100 MB"),
+                     (float("inf"), ">=100 MB")]
+
+GROUP_BY_FIELDS = ("model", "provider", "size", "kind")
+
+SESSION_KINDS = ("transcription", "stream", "download", "warmup")
+
+
+class LatencyHistogram:
+    """
+    Mergeable histogram with logarithmic buckets for percentile estimates.
+
+    Every bucket spans a fixed ratio of values, so quantiles are accurate to
+    within relative_accuracy whatever the range, and memory grows with the
+    log of the value range rather than with the number of samples. Two
+    histograms with the same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def stats(self, suffix: str = "_ms", digits: int = 2) -> Dict[str, Any]:
+        """avg/min/max/p50/p90/p95/p99 keyed with the given unit suffix, plus count"""
+        if not self.count:
+            return {"count": 0}
+        stats = {
+            f"avg{suffix}": round(self.total / self.count, digits),
+            f"min{suffix}": round(self.min, digits),
+            f"max{suffix}": round(self.max, digits)
+        }
+        for q in (50, 90, 95, 99):
+            stats[f"p{q}{suffix}"] = round(self.quantile(q / 100), digits)
+        stats["count"] = self.count
+        return stats
+
+
+class SessionAggregator:
+    """Accumulates session statistics in constant memory; aggregators merge"""
+
+    def __init__(self):
+        self.total_sessions = 0
+        self.successful_sessions = 0
+        self.cached_sessions = 0
+        self.file_size_mb = 0.0
+        self.file_size_count = 0
+        self.total_times = LatencyHistogram()
+        self.steps: Dict[str, LatencyHistogram] = {}
+        # provider/model -> [RTF histogram, audio seconds, processing seconds]
+        self.rtf: Dict[str, list] = {}
+
+    def add(self, session: Dict[str, Any]) -> None:
+        self.total_sessions += 1
+        if session.get("success", False):
+            self.successful_sessions += 1
+        if "file_size_mb" in session:
+            self.file_size_mb += session["file_size_mb"]
+            self.file_size_count += 1
+        if session_cached(session):
+            # Served from the transcript cache; near-zero times would skew latency and RTF
+            self.cached_sessions += 1
+            return
+        if "total_time_ms" in session:
+            self.total_times.add(session["total_time_ms"])
+        for step_name, step_data in session.get("steps", {}).items():
+            self.steps.setdefault(step_name, LatencyHistogram()).add(step_data["duration_ms"])
+        if session.get("rtf") is not None:
+            group = f"{session.get('provider') or 'unknown'}/{session.get('model') or 'unknown'}"
+            totals = self.rtf.setdefault(group, [LatencyHistogram(), 0.0, 0.0])
+            totals[0].add(session["rtf"])
+            totals[1] += session["audio_duration_s"]
+            totals[2] += session["total_time_ms"] / 1000
+
+    def merge(self, other: "SessionAggregator") -> None:
+        self.total_sessions += other.total_sessions
+        self.successful_sessions += other.successful_sessions
+        self.cached_sessions += other.cached_sessions
+        self.file_size_mb += other.file_size_mb
+        self.file_size_count += other.file_size_count
+        self.total_times.merge(other.total_times)
+        for step_name, histogram in other.steps.items():
+            self.steps.setdefault(step_name, LatencyHistogram()).merge(histogram)
+        for group, (histogram, audio_s, processing_s) in other.rtf.items():
+            totals = self.rtf.setdefault(group, [LatencyHistogram(), 0.0, 0.0])
+            totals[0].merge(histogram)
+            totals[1] += audio_s
+            totals[2] += processing_s
+
+    @staticmethod
+    def _rtf_stats(histogram: LatencyHistogram, audio_s: float, processing_s: float) -> Dict[str, Any]:
+        # aggregate_rtf (total processing over total audio) is the figure to plan capacity with
+        return {
+            **histogram.stats(suffix="_rtf", digits=4),
+            "aggregate_rtf": round(processing_s / audio_s, 4) if audio_s else 0,
+            "audio_seconds": round(audio_s, 1)
+        }
+
+    def result(self) -> Dict[str, Any]:
+        """Analysis dictionary (the shape returned by analyze_logs)"""
+        total_sessions = self.total_sessions
+        successful_sessions = self.successful_sessions
+        total_times = self.total_times.stats()
+
+        overall = {
+            f"{stat}_total_time_ms": total_times.get(f"{stat}_ms", 0)
+            for stat in ("avg", "min", "max", "p50", "p90", "p95", "p99")
+        }
+        overall["avg_file_size_mb"] = round(self.file_size_mb / self.file_size_count, 2) if self.file_size_count else 0
+        if self.rtf:
+            combined = [LatencyHistogram(), 0.0, 0.0]
+            for histogram, audio_s, processing_s in self.rtf.values():
+                combined[0].merge(histogram)
+                combined[1] += audio_s
+                combined[2] += processing_s
+            overall["rtf"] = self._rtf_stats(*combined)
+
+        return {
+            "summary": {
+                "total_sessions": total_sessions,
+                "successful_sessions": successful_sessions,
+                "failed_sessions": total_sessions - successful_sessions,
+                "cached_sessions": self.cached_sessions,
+                "success_rate": round((successful_sessions / total_sessions) * 100, 1) if total_sessions > 0 else 0
+            },
+            "overall_performance": overall,
+            "step_performance": {step: histogram.stats() for step, histogram in self.steps.items()},
+            "rtf_by_model": {group: self._rtf_stats(*totals) for group, totals in self.rtf.items()},
+            "analyzed_sessions": total_sessions
+        }
+
+
+def session_cached(session: Dict[str, Any]) -> bool:
+    """Whether a session was answered from the transcript cache instead of being processed"""
+    if "cached" in session:
+        return bool(session["cached"])
+    # Older sessions only record the hit on their result_cache step
+    return session.get("steps", {}).get("result_cache", {}).get("hit") is True
+
+
+def session_kind(session: Dict[str, Any]) -> str:
+    """
+    Operation a session timed (see SESSION_KINDS).
+
+    Sessions logged before the kind field existed are recognized by the
+    label prefix the bridge gave them; anything else was a transcription.
+    """
+    kind = session.get("kind")
+    if kind:
+        return kind
+    label = session.get("audio_file") or ""
+    return next((prefix for prefix in ("download", "warmup", "stream") if label.startswith(f"{prefix}-")),
+                "transcription")
+
+
+def session_group(session: Dict[str, Any], group_by: str) -> str:
+    """Group label of a session for group_by ("model", "provider", "size" or "kind")"""
+    if group_by == "kind":
+        return session_kind(session)
+    if group_by == "size":
+        size_mb = session.get("file_size_mb", 0)
+        return next(label for limit, label in FILE_SIZE_BUCKETS if size_mb < limit)
+    if group_by not in GROUP_BY_FIELDS:
+        raise ValueError(f"Unknown group_by field: {group_by}")
+    return str(session.get(group_by) or "unknown")
+
+
+def iter_log_sessions(log_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield sessions from a log and its rotated segments, oldest first, one at a time.
+
+    Unparsable records are skipped. Logs written by older versions joined
+    sessions with a literal backslash-n on a single line; those are split
+    back into sessions.
+    """
+    decoder = json.JSONDecoder()
+    for segment in log_segments(log_file):
+        opener = gzip.open if segment.endswith('.gz') else open
+        try:
+            with opener(segment, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    position = 0
+                    while position < len(line):
+                        try:
+                            session, position = decoder.raw_decode(line, position)
+                        except json.JSONDecodeError:
+                            # Resynchronize on the next record of a damaged legacy line
+                            position = line.find('\\n{', position)
+                            if position < 0:
+                                break
+                            position += 2
+                            continue
+                        if isinstance(session, dict):
+                            yield session
+                        while line.startswith('\\n', position) or line[position:position + 1].isspace():
+                            position += 2 if line[position] == '\\' else 1
+        except (OSError, EOFError):
+            continue
+
+
 def analyze_logs(log_file: str = "performance_logs.jsonl", 
-                 last_n: Optional[int] = None) -> Dict[str, Any]:
+                 last_n: Optional[int] = None, group_by: Optional[str] = None,
+                 kinds: Optional[Iterable[str]] = ("transcription",)) -> Dict[str, Any]:
     """
     Analyze performance logs and generate statistics.
 
+    The log is streamed, so memory stays constant however large it is
+    (last_n keeps at most N sessions).
+
     Args:
         log_file: Path to the log file
-        last_n: Only analyze the last N entries (None for all)
+        last_n: Only analyze the last N matching entries (None for all)
+        group_by: Also break the statistics down by "model", "provider", "size" or "kind"
+        kinds: Session kinds to include (None for all); by default only
+            transcriptions, so downloads and warmups don't skew the figures
 
     Returns:
         Dictionary containing analysis results
     """
-    if not os.path.exists(log_file):
+    if not log_segments(log_file):
         return {"error": "Log file not found"}
 
-    sessions = []
-    with open(log_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            try:
-                sessions.append(json.loads(line.strip()))
-            except json.JSONDecodeError:
-                continue
+    sessions = iter_log_sessions(log_file)
+    if kinds is not None:
+        kinds = set(kinds)
+        sessions = (session for session in sessions if session_kind(session) in kinds)
+    if last_n:
+        sessions = deque(sessions, maxlen=last_n)
 
-    if not sessions:
+    analysis = summarize_sessions(sessions, group_by)
+    if not analysis["analyzed_sessions"]:
         return {"error": "No valid sessions found"}
+    return analysis
 
-    # Get last N sessions if specified
-    if last_n:
-        sessions = sessions[-last_n:]
 
-    # Calculate statistics
-    total_sessions = len(sessions)
-    successful_sessions = sum(1 for s in sessions if s.get("success", False))
+def summarize_sessions(sessions: Iterable[Dict[str, Any]], group_by: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate statistics for a sequence of session dictionaries.
+
+    Args:
+        sessions: Session dictionaries as returned by end_session(); consumed once
+        group_by: Also break the statistics down by "model", "provider", "size" or "kind"
 
-    # Average times per step
-    step_times = {}
+    Returns:
+        Dictionary containing analysis results (same shape as analyze_logs)
+    """
+    if group_by is None:
+        aggregator = SessionAggregator()
+        for session in sessions:
+            aggregator.add(session)
+        return aggregator.result()
+
+    groups: Dict[str, SessionAggregator] = {}
     for session in sessions:
-        for step_name, step_data in session.get("steps", {}).items():
-            if step_name not in step_times:
-                step_times[step_name] = []
-            step_times[step_name].append(step_data["duration_ms"])
-
-    step_averages = {
-        step: {
-            "avg_ms": round(sum(times) / len(times), 2),
-            "min_ms": round(min(times), 2),
-            "max_ms": round(max(times), 2),
-            "count": len(times)
-        }
-        for step, times in step_times.items()
-    }
-
-    # Overall statistics
-    total_times = [s["total_time_ms"] for s in sessions if "total_time_ms" in s]
-    file_sizes = [s["file_size_mb"] for s in sessions if "file_size_mb" in s]
-
-    analysis = {
-        "summary": {
-            "total_sessions": total_sessions,
-            "successful_sessions": successful_sessions,
-            "failed_sessions": total_sessions - successful_sessions,
-            "success_rate": round((successful_sessions / total_sessions) * 100, 1) if total_sessions > 0 else 0
-        },
-        "overall_performance": {
-            "avg_total_time_ms": round(sum(total_times) / len(total_times), 2) if total_times else 0,
-            "min_total_time_ms": round(min(total_times), 2) if total_times else 0,
-            "max_total_time_ms": round(max(total_times), 2) if total_times else 0,
-            "avg_file_size_mb": round(sum(file_sizes) / len(file_sizes), 2) if file_sizes else 0
-        },
-        "step_performance": step_averages,
-        "analyzed_sessions": total_sessions
-    }
+        groups.setdefault(session_group(session, group_by), SessionAggregator()).add(session)
 
+    overall = SessionAggregator()
+    for aggregator in groups.values():
+        overall.merge(aggregator)
+
+    analysis = overall.result()
+    analysis["group_by"] = group_by
+    analysis["groups"] = {label: aggregator.result() for label, aggregator in groups.items()}
     return analysis
 
 
-def print_analysis(analysis: Dict[str, Any]) -> None:
-    """Print formatted analysis results"""
+def chrome_trace(sessions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert sessions to Chrome Trace Event format (viewable in Perfetto or about:tracing).
+
+    Each session becomes a process and every span a complete ("X") event on
+    the thread that ran it. Sessions logged before span tracing are laid out
+    from their steps, one after another.
+
+    Args:
+        sessions: Session dictionaries as returned by end_session()
+
+    Returns:
+        Trace dictionary ready to be written with json.dump
+    """
+    events = []
+    for pid, session in enumerate(sessions, start=1):
+        try:
+            base_us = datetime.fromisoformat(session["timestamp"]).timestamp() * 1_000_000
+        except (KeyError, TypeError, ValueError):
+            base_us = 0
+
+        spans = session.get("spans")
+        if spans is None:
+            spans, offset_ms = [], 0.0
+            for step_name, step_data in session.get("steps", {}).items():
+                spans.append({"name": step_name, "start_ms": offset_ms, "duration_ms": step_data["duration_ms"],
+                              "thread_id": 0, "thread_name": "main", "metadata": {
+                                  k: v for k, v in step_data.items() if k != "duration_ms"}})
+                offset_ms += step_data["duration_ms"]
+
+        label = session.get("audio_file", f"session {pid}")
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                       "args": {"name": f"{label} ({session.get('timestamp', '')})"}})
+        threads = {}
+        for span in spans:
+            tid = span.get("thread_id") or 0
+            threads.setdefault(tid, span.get("thread_name") or str(tid))
+            args = dict(span.get("metadata", {}))
+            if span.get("cpu_ms") is not None:
+                args["cpu_ms"] = span["cpu_ms"]
+            events.append({
+                "name": span["name"],
+                "cat": "step",
+                "ph": "X",
+                "ts": round(base_us + span["start_ms"] * 1000, 3),
+                "dur": round(span["duration_ms"] * 1000, 3),
+                "pid": pid,
+                "tid": tid,
+                "args": args
+            })
+
+        main_tid = next(iter(threads), 0)
+        threads.setdefault(main_tid, "main")
+        events.append({
+            "name": label,
+            "cat": "session",
+            "ph": "X",
+            "ts": round(base_us, 3),
+            "dur": round(session.get("total_time_ms", 0) * 1000, 3),
+            "pid": pid,
+            "tid": main_tid,
+            "args": {"success": session.get("success", False), "file_size_mb": session.get("file_size_mb", 0),
+                     **({"error": session["error"]} if session.get("error") else {})}
+        })
+        for tid, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": thread_name}})
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(log_file: str = "performance_logs.jsonl", output_file: str = "trace.json",
+                        last_n: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Write logged sessions as a Chrome Trace Event JSON file.
+
+    Args:
+        log_file: Path to the log file
+        output_file: Path of the trace file to write
+        last_n: Only export the last N sessions (None for all)
+
+    Returns:
+        Dictionary with the number of exported sessions, or an error
+    """
+    if not log_segments(log_file):
+        return {"error": "Log file not found"}
+
+    sessions = list(deque(iter_log_sessions(log_file), maxlen=last_n) if last_n else iter_log_sessions(log_file))
+    if not sessions:
+        return {"error": "No valid sessions found"}
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(sessions), f)
+
+    return {"output_file": output_file, "exported_sessions": len(sessions)}
+
+
+def print_analysis(analysis: Dict[str, Any], title: str = "Performance Analysis Report") -> None:
+    """Print formatted analysis results, followed by one report per group if grouped"""
     if "error" in analysis:
         print(f"Error: {analysis['error']}")
         return
 
     print(f"\n{'='*70}")
-    print(f"Performance Analysis Report")
+    print(title)
     print(f"{'='*70}")
 
     # Summary
@@ -279,6 +1033,8 @@ def print_analysis(analysis: Dict[str, Any]) -> None:
     print(f"   Total Sessions: {summary['total_sessions']}")
     print(f"   Successful: {summary['successful_sessions']} ({summary['success_rate']}%)")
     print(f"   Failed: {summary['failed_sessions']}")
+    if summary.get("cached_sessions"):
+        print(f"   Cache Hits: {summary['cached_sessions']} (left out of timings and RTF)")
 
     # Overall performance
     overall = analysis["overall_performance"]
@@ -286,12 +1042,17 @@ def print_analysis(analysis: Dict[str, Any]) -> None:
     print(f"   Average Total Time: {overall['avg_total_time_ms']:.0f}ms")
     print(f"   Min Total Time: {overall['min_total_time_ms']:.0f}ms")
     print(f"   Max Total Time: {overall['max_total_time_ms']:.0f}ms")
+    print(f"   P50 / P95 / P99: {overall['p50_total_time_ms']:.0f}ms / {overall['p95_total_time_ms']:.0f}ms / "
+          f"{overall['p99_total_time_ms']:.0f}ms")
     print(f"   Average File Size: {overall['avg_file_size_mb']:.2f} MB")
+    if "rtf" in overall:
+        print(f"   Real-Time Factor: {overall['rtf']['aggregate_rtf']:.3f} "
+              f"({overall['rtf']['audio_seconds']:.0f}s of audio)")
 
     # Step performance
-    print(f"\nStep Performance (Average):")
-    print(f"   {'Step':<30} {'Avg':<12} {'Min':<12} {'Max':<12} {'Count':<8}")
-    print(f"   {'-'*74}")
+    print(f"\nStep Performance:")
+    print(f"   {'Step':<24} {'Avg':<10} {'P50':<10} {'P95':<10} {'P99':<10} {'Max':<10} {'Count':<6}")
+    print(f"   {'-'*82}")
 
     # Sort by average time
     sorted_steps = sorted(
@@ -301,10 +1062,22 @@ def print_analysis(analysis: Dict[str, Any]) -> None:
     )
 
     for step_name, stats in sorted_steps:
-        print(f"   {step_name:<30} {stats['avg_ms']:>8.0f}ms   {stats['min_ms']:>8.0f}ms   {stats['max_ms']:>8.0f}ms   {stats['count']:>5}")
+        print(f"   {step_name:<24} {stats['avg_ms']:>6.0f}ms   {stats['p50_ms']:>6.0f}ms   {stats['p95_ms']:>6.0f}ms   "
+              f"{stats['p99_ms']:>6.0f}ms   {stats['max_ms']:>6.0f}ms   {stats['count']:>5}")
+
+    if analysis.get("rtf_by_model"):
+        print(f"\nReal-Time Factor by Model:")
+        print(f"   {'Provider/Model':<30} {'Aggregate':<12} {'Avg':<10} {'Max':<10} {'Audio':<10} {'Count':<8}")
+        print(f"   {'-'*80}")
+        for group, stats in sorted(analysis["rtf_by_model"].items()):
+            print(f"   {group:<30} {stats['aggregate_rtf']:>9.3f}   {stats['avg_rtf']:>7.3f}   "
+                  f"{stats['max_rtf']:>7.3f}   {stats['audio_seconds']:>7.0f}s   {stats['count']:>5}")
 
     print(f"{'='*70}\n")
 
+    for label, group_analysis in sorted(analysis.get("groups", {}).items()):
+        print_analysis(group_analysis, title=f"{analysis['group_by']}: {label}")
+
 
 if __name__ == "__main__":
     import argparse
@@ -312,8 +1085,22 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Analyze performance logs")
     parser.add_argument("--log-file", default="performance_logs.jsonl", help="Path to log file")
     parser.add_argument("--last", type=int, help="Analyze only the last N sessions")
+    parser.add_argument("--group-by", choices=GROUP_BY_FIELDS,
+                        help="Also report statistics per model, provider, file size bucket or session kind")
+    parser.add_argument("--kind", action="append", choices=SESSION_KINDS + ("all",),
+                        help="Session kinds to analyze (repeatable; default: transcription)")
+    parser.add_argument("--export-trace", metavar="PATH",
+                        help="Write the sessions as a Chrome Trace (Perfetto) JSON file instead of analyzing them")
 
     args = parser.parse_args()
 
-    analysis = analyze_logs(args.log_file, args.last)
-    print_analysis(analysis)
+    if args.export_trace:
+        result = export_chrome_trace(args.log_file, args.export_trace, args.last)
+        if "error" in result:
+            print(f"Error: {result['error']}")
+        else:
+            print(f"Wrote {result['exported_sessions']} sessions to {result['output_file']}")
+    else:
+        kinds = None if args.kind and "all" in args.kind else (args.kind or ("transcription",))
+        analysis = analyze_logs(args.log_file, args.last, args.group_by, kinds)
+        print_analysis(analysis)
@@ -78,6 +78,8 @@ contextBridge.exposeInMainWorld("electronAPI", {
   // Local Whisper functions
   transcribeLocalWhisper: (audioBlob, options) =>
     ipcRenderer.invoke("transcribe-local-whisper", audioBlob, options),
+  warmupLocalWhisper: (modelName) =>
+    ipcRenderer.invoke("warmup-local-whisper", modelName),
   checkWhisperInstallation: () =>
     ipcRenderer.invoke("check-whisper-installation"),
   installWhisper: () => ipcRenderer.invoke("install-whisper"),
@@ -174,6 +174,10 @@ class IPCHandlers {
       }
     );
 
+    ipcMain.handle("warmup-local-whisper", async (event, modelName) => {
+      return this.whisperManager.warmupLocalWhisper(modelName);
+    });
+
     ipcMain.handle("check-whisper-installation", async (event) => {
       return this.whisperManager.checkWhisperInstallation();
     });
@@ -4,10 +4,14 @@ const fsPromises = require("fs").promises;
 const os = require("os");
 const path = require("path");
 const crypto = require("crypto");
+const readline = require("readline");
 const PythonInstaller = require("./pythonInstaller");
 const { runCommand, TIMEOUTS } = require("../utils/process");
 const debugLogger = require("./debugLogger");
 
+// Time a daemon gets to exit after SIGTERM before it is killed outright
+const DAEMON_KILL_GRACE_MS = 5000;
+
 class WhisperManager {
   constructor() {
     this.pythonCmd = null;
@@ -16,6 +20,7 @@ class WhisperManager {
     this.currentDownloadProcess = null;
     this.pythonInstaller = new PythonInstaller();
     this.cachedFFmpegPath = null;
+    this.whisperDaemon = null;
   }
 
   sanitizeErrorMessage(message = "") {
@@ -101,11 +106,48 @@ class WhisperManager {
       throw new Error(`FFmpeg not available: ${ffmpegCheck.error || 'Unknown error'}`);
     }
 
-    const tempAudioPath = await this.createTempAudioFile(audioBlob);
     const model = options.model || "base";
     const language = options.language || null;
 
+    // Send PCM WAV straight to the daemon over stdin so no temp file is needed
+    const audioBuffer = this.audioBlobToBuffer(audioBlob);
+    const sendInline = this.validateWavHeader(audioBuffer);
+    if (sendInline) {
+      try {
+        const daemonResult = await this.sendDaemonRequest(
+          "transcribe",
+          { model, language, pcm: { format: "wav", bytes: audioBuffer.length } },
+          1200000,
+          audioBuffer
+        );
+        return this.interpretWhisperResult(daemonResult);
+      } catch (daemonError) {
+        // Trying the daemon again with a temp file would only wait out another timeout
+        debugLogger.error('Whisper daemon unavailable, spawning process:', daemonError.message);
+      }
+    }
+
+    const tempAudioPath = await this.createTempAudioFile(audioBlob);
+
     try {
+      let daemonResult = null;
+      if (!sendInline) {
+        try {
+          daemonResult = await this.sendDaemonRequest(
+            "transcribe",
+            { audio_path: tempAudioPath, model, language },
+            1200000
+          );
+        } catch (daemonError) {
+          // Fall back to a one-shot process if the daemon is unavailable
+          debugLogger.error('Whisper daemon unavailable, spawning process:', daemonError.message);
+        }
+      }
+
+      if (daemonResult) {
+        return this.interpretWhisperResult(daemonResult);
+      }
+
       const result = await this.runWhisperProcess(
         tempAudioPath,
         model,
@@ -119,6 +161,27 @@ class WhisperManager {
     }
   }
 
+  async warmupLocalWhisper(modelName = "base") {
+    debugLogger.logWhisperPipeline('warmupLocalWhisper - start', { modelName });
+    try {
+      const result = await this.sendDaemonRequest(
+        "warmup",
+        { model: modelName },
+        TIMEOUTS.DOWNLOAD
+      );
+      debugLogger.logWhisperPipeline('warmupLocalWhisper - done', {
+        success: result.success,
+        loadTimeMs: result.load_time_ms,
+        warmupTimeMs: result.warmup_time_ms,
+        error: result.error
+      });
+      return result;
+    } catch (error) {
+      // Warm-up is an optimization; transcription still works without it
+      return { success: false, error: error.message };
+    }
+  }
+
   validateWavHeader(buffer) {
     try {
       if (!buffer || buffer.length < 44) {
@@ -151,6 +214,20 @@ class WhisperManager {
     }
   }
 
+  audioBlobToBuffer(audioBlob) {
+    if (audioBlob instanceof ArrayBuffer) {
+      return Buffer.from(audioBlob);
+    } else if (audioBlob instanceof Uint8Array) {
+      return Buffer.from(audioBlob);
+    } else if (typeof audioBlob === "string") {
+      return Buffer.from(audioBlob, "base64");
+    } else if (audioBlob && audioBlob.buffer) {
+      return Buffer.from(audioBlob.buffer);
+    }
+    debugLogger.error('Unsupported audio data type:', typeof audioBlob, audioBlob);
+    throw new Error(`Unsupported audio data type: ${typeof audioBlob}`);
+  }
+
   async createTempAudioFile(audioBlob) {
     const tempDir = os.tmpdir();
     const filename = `whisper_audio_${crypto.randomUUID()}.wav`;
@@ -159,20 +236,7 @@ class WhisperManager {
     debugLogger.logAudioData('createTempAudioFile', audioBlob);
     debugLogger.log('Creating temp file at:', tempAudioPath);
 
-    let buffer;
-    if (audioBlob instanceof ArrayBuffer) {
-      buffer = Buffer.from(audioBlob);
-    } else if (audioBlob instanceof Uint8Array) {
-      buffer = Buffer.from(audioBlob);
-    } else if (typeof audioBlob === "string") {
-      buffer = Buffer.from(audioBlob, "base64");
-    } else if (audioBlob && audioBlob.buffer) {
-      buffer = Buffer.from(audioBlob.buffer);
-    } else {
-      debugLogger.error('Unsupported audio data type:', typeof audioBlob, audioBlob);
-      throw new Error(`Unsupported audio data type: ${typeof audioBlob}`);
-    }
-
+    const buffer = this.audioBlobToBuffer(audioBlob);
     debugLogger.log('Buffer created, size:', buffer.length);
 
     // RELAXED VALIDATION: Log warning but allow processing
@@ -357,6 +421,246 @@ class WhisperManager {
     return candidates;
   }
 
+  buildWhisperEnv(ffmpegPath) {
+    // Enhanced environment setup - Python script checks multiple env vars
+    const absoluteFFmpegPath = path.resolve(ffmpegPath);
+    const enhancedEnv = {
+      ...process.env,
+      FFMPEG_PATH: absoluteFFmpegPath,
+      FFMPEG_EXECUTABLE: absoluteFFmpegPath,
+      FFMPEG_BINARY: absoluteFFmpegPath,
+      PYTHONIOENCODING: "utf-8",
+    };
+
+    debugLogger.logFFmpegDebug('Setting FFmpeg env vars', absoluteFFmpegPath);
+
+    // Add ffmpeg directory to PATH if we have a valid path
+    if (ffmpegPath) {
+      const ffmpegDir = path.dirname(absoluteFFmpegPath);
+      const currentPath = enhancedEnv.PATH || "";
+      const pathSeparator = process.platform === "win32" ? ";" : ":";
+
+      if (!currentPath.includes(ffmpegDir)) {
+        enhancedEnv.PATH = `${ffmpegDir}${pathSeparator}${currentPath}`;
+      }
+    }
+
+    // Add common system paths for macOS GUI launches
+    if (process.platform === "darwin") {
+      const commonPaths = [
+        "/usr/local/bin",
+        "/opt/homebrew/bin",
+        "/opt/homebrew/sbin",
+        "/usr/bin",
+        "/bin",
+        "/usr/sbin",
+        "/sbin"
+      ];
+
+      const currentPath = enhancedEnv.PATH || "";
+      const pathsToAdd = commonPaths.filter(p => !currentPath.includes(p));
+
+      if (pathsToAdd.length > 0) {
+        enhancedEnv.PATH = `${currentPath}:${pathsToAdd.join(":")}`;
+        debugLogger.log('Added system paths for GUI launch');
+      }
+    }
+
+    return enhancedEnv;
+  }
+
+  async startWhisperDaemon() {
+    const pythonCmd = await this.findPythonExecutable();
+    const whisperScriptPath = this.getWhisperScriptPath();
+
+    if (!fs.existsSync(whisperScriptPath)) {
+      throw new Error(`Whisper script not found at: ${whisperScriptPath}`);
+    }
+
+    const ffmpegPath = await this.resolveFfmpegPath();
+    if (!ffmpegPath) {
+      throw new Error('FFmpeg not found. Please ensure FFmpeg is installed or bundled correctly.');
+    }
+
+    const args = [whisperScriptPath, "--mode", "serve"];
+    debugLogger.logProcessStart(pythonCmd, args, {});
+
+    const env = this.buildWhisperEnv(ffmpegPath);
+    const daemonProcess = spawn(pythonCmd, args, {
+      stdio: ["pipe", "pipe", "pipe"],
+      windowsHide: true,
+      env,
+    });
+
+    const daemon = {
+      process: daemonProcess,
+      pending: new Map(),
+      nextRequestId: 1,
+      exited: false,
+      // The daemon only sees the environment it was spawned with
+      groqApiKey: env.GROQ_API_KEY || "",
+    };
+
+    const ready = new Promise((resolve, reject) => {
+      const readyTimeout = setTimeout(() => {
+        reject(new Error("Whisper daemon did not become ready in time"));
+        daemonProcess.kill("SIGTERM");
+      }, TIMEOUTS.COMMAND);
+
+      daemon.onReady = () => {
+        clearTimeout(readyTimeout);
+        resolve(daemon);
+      };
+      daemon.onStartFailure = (error) => {
+        clearTimeout(readyTimeout);
+        reject(error);
+      };
+    });
+
+    const lines = readline.createInterface({ input: daemonProcess.stdout });
+    lines.on("line", (line) => {
+      let message;
+      try {
+        message = JSON.parse(line);
+      } catch (parseError) {
+        debugLogger.log('Ignoring non-JSON daemon output:', line);
+        return;
+      }
+
+      if (message.type === "ready") {
+        daemon.onReady();
+        return;
+      }
+
+      const pendingRequest = daemon.pending.get(message.id);
+      if (pendingRequest) {
+        daemon.pending.delete(message.id);
+        clearTimeout(pendingRequest.timeout);
+        pendingRequest.resolve(message);
+      }
+    });
+
+    daemonProcess.stderr.on("data", (data) => {
+      debugLogger.logProcessOutput('WhisperDaemon', 'stderr', data);
+    });
+
+    const handleExit = (error) => {
+      daemon.exited = true;
+      daemon.onStartFailure(error);
+      for (const pendingRequest of daemon.pending.values()) {
+        clearTimeout(pendingRequest.timeout);
+        pendingRequest.reject(error);
+      }
+      daemon.pending.clear();
+    };
+
+    daemonProcess.on("exit", (code) => {
+      debugLogger.logWhisperPipeline('Whisper daemon exited', { code });
+      handleExit(new Error(`Whisper daemon exited (code ${code})`));
+    });
+
+    daemonProcess.on("error", (error) => {
+      handleExit(new Error(`Whisper daemon error: ${error.message}`));
+    });
+
+    // Writing to a daemon that died raises EPIPE here; without a listener it would crash the app
+    daemonProcess.stdin.on("error", (error) => {
+      debugLogger.error('Whisper daemon stdin error:', error.message);
+      handleExit(new Error(`Whisper daemon stdin error: ${error.message}`));
+    });
+
+    // A stuck daemon would never reach a shutdown request, so it is killed instead.
+    // Marking it exited right away makes getWhisperDaemon start a fresh one.
+    daemon.terminate = (error) => {
+      handleExit(error);
+      daemonProcess.kill("SIGTERM");
+      const killTimer = setTimeout(() => {
+        if (daemonProcess.exitCode === null && daemonProcess.signalCode === null) {
+          daemonProcess.kill("SIGKILL");
+        }
+      }, DAEMON_KILL_GRACE_MS);
+      killTimer.unref();
+    };
+
+    return ready;
+  }
+
+  async getWhisperDaemon() {
+    const current = this.whisperDaemon;
+    if (current) {
+      const daemon = await current;
+      if (!daemon.exited && daemon.groqApiKey === (process.env.GROQ_API_KEY || "")) {
+        return daemon;
+      }
+      if (this.whisperDaemon !== current) {
+        // Another caller already replaced it
+        return this.getWhisperDaemon();
+      }
+      if (!daemon.exited) {
+        // saveGroqKey updated process.env; restart so the daemon picks up the new key
+        debugLogger.log('Groq API key changed, restarting Whisper daemon');
+        this.stopWhisperDaemon();
+      }
+    }
+
+    const daemonPromise = this.startWhisperDaemon();
+    this.whisperDaemon = daemonPromise;
+    daemonPromise.catch(() => {
+      if (this.whisperDaemon === daemonPromise) {
+        this.whisperDaemon = null;
+      }
+    });
+    return daemonPromise;
+  }
+
+  async sendDaemonRequest(type, payload = {}, timeoutMs = TIMEOUTS.COMMAND, binaryPayload = null) {
+    const daemon = await this.getWhisperDaemon();
+    const id = daemon.nextRequestId++;
+
+    return new Promise((resolve, reject) => {
+      if (daemon.exited) {
+        // Died after getWhisperDaemon returned it; callers fall back to a one-shot process
+        reject(new Error(`Whisper daemon exited before request "${type}" was sent`));
+        return;
+      }
+
+      const timeout = setTimeout(() => {
+        daemon.pending.delete(id);
+        reject(new Error(`Whisper daemon request "${type}" timed out`));
+        debugLogger.error('Whisper daemon timed out, restarting it:', type);
+        daemon.terminate(new Error(`Whisper daemon was restarted after "${type}" timed out`));
+      }, timeoutMs);
+
+      daemon.pending.set(id, { resolve, reject, timeout });
+      daemon.process.stdin.write(JSON.stringify({ id, type, ...payload }) + "\n");
+      if (binaryPayload) {
+        // Raw audio bytes follow the request line, as announced in pcm.bytes
+        daemon.process.stdin.write(binaryPayload);
+      }
+    });
+  }
+
+  stopWhisperDaemon() {
+    const daemonPromise = this.whisperDaemon;
+    this.whisperDaemon = null;
+    if (!daemonPromise) {
+      return;
+    }
+
+    daemonPromise
+      .then((daemon) => {
+        try {
+          daemon.process.stdin.write(JSON.stringify({ type: "shutdown" }) + "\n");
+          daemon.process.stdin.end();
+        } catch (error) {
+          daemon.process.kill("SIGTERM");
+        }
+      })
+      .catch(() => {
+        // Daemon never started, nothing to stop
+      });
+  }
+
   async runWhisperProcess(tempAudioPath, model, language) {
     const pythonCmd = await this.findPythonExecutable();
     const whisperScriptPath = this.getWhisperScriptPath();
@@ -380,49 +684,7 @@ class WhisperManager {
         return;
       }
 
-      // Enhanced environment setup - Python script checks multiple env vars
-      const absoluteFFmpegPath = path.resolve(ffmpegPath);
-      const enhancedEnv = {
-        ...process.env,
-        FFMPEG_PATH: absoluteFFmpegPath,
-        FFMPEG_EXECUTABLE: absoluteFFmpegPath,
-        FFMPEG_BINARY: absoluteFFmpegPath,
-        PYTHONIOENCODING: "utf-8",
-      };
-
-      debugLogger.logFFmpegDebug('Setting FFmpeg env vars', absoluteFFmpegPath);
-
-      // Add ffmpeg directory to PATH if we have a valid path
-      if (ffmpegPath) {
-        const ffmpegDir = path.dirname(absoluteFFmpegPath);
-        const currentPath = enhancedEnv.PATH || "";
-        const pathSeparator = process.platform === "win32" ? ";" : ":";
-
-        if (!currentPath.includes(ffmpegDir)) {
-          enhancedEnv.PATH = `${ffmpegDir}${pathSeparator}${currentPath}`;
-        }
-      }
-
-      // Add common system paths for macOS GUI launches
-      if (process.platform === "darwin") {
-        const commonPaths = [
-          "/usr/local/bin",
-          "/opt/homebrew/bin",
-          "/opt/homebrew/sbin",
-          "/usr/bin",
-          "/bin",
-          "/usr/sbin",
-          "/sbin"
-        ];
-
-        const currentPath = enhancedEnv.PATH || "";
-        const pathsToAdd = commonPaths.filter(p => !currentPath.includes(p));
-
-        if (pathsToAdd.length > 0) {
-          enhancedEnv.PATH = `${currentPath}:${pathsToAdd.join(":")}`;
-          debugLogger.log('Added system paths for GUI launch');
-        }
-      }
+      const enhancedEnv = this.buildWhisperEnv(ffmpegPath);
 
       const envDebugInfo = {
         FFMPEG_PATH: enhancedEnv.FFMPEG_PATH,
@@ -539,24 +801,26 @@ class WhisperManager {
         throw new Error("No JSON output found in Whisper response");
       }
 
-      const result = JSON.parse(jsonLine);
-
-      // Handle explicit error from Python script
-      if (result.success === false) {
-        return { success: false, error: result.error || "Unknown Whisper error" };
-      }
-
-      // Handle empty transcription (succcess=true but empty text)
-      if (!result.text || result.text.trim().length === 0) {
-        return { success: false, message: "No audio detected" };
-      }
-      return { success: true, text: result.text.trim() };
+      return this.interpretWhisperResult(JSON.parse(jsonLine));
     } catch (parseError) {
       debugLogger.error('Failed to parse Whisper output');
       throw new Error(`Failed to parse Whisper output: ${parseError.message}`);
     }
   }
 
+  interpretWhisperResult(result) {
+    // Handle explicit error from Python script
+    if (result.success === false) {
+      return { success: false, error: result.error || "Unknown Whisper error" };
+    }
+
+    // Handle empty transcription (succcess=true but empty text)
+    if (!result.text || result.text.trim().length === 0) {
+      return { success: false, message: "No audio detected" };
+    }
+    return { success: true, text: result.text.trim() };
+  }
+
   async cleanupTempFile(tempAudioPath) {
     try {
       await fsPromises.unlink(tempAudioPath);
@@ -87,10 +87,32 @@ export const useAudioRecording = (toast, options = {}) => {
       handleNoAudioDetected
     );
 
+    // Warm up the local model at startup and whenever the selection changes,
+    // so the first dictation does not pay the model load cost
+    const warmupLocalWhisper = () => {
+      if (localStorage.getItem("useLocalWhisper") !== "true") {
+        return;
+      }
+      const whisperModel = localStorage.getItem("whisperModel") || "base";
+      window.electronAPI.warmupLocalWhisper?.(whisperModel).catch(() => {
+        // Warm-up failures are not critical
+      });
+    };
+
+    const handleStorageChange = (event) => {
+      if (event.key === "whisperModel" || event.key === "useLocalWhisper") {
+        warmupLocalWhisper();
+      }
+    };
+
+    warmupLocalWhisper();
+    window.addEventListener("storage", handleStorageChange);
+
     // Cleanup
     return () => {
       disposeToggle?.();
       disposeNoAudio?.();
+      window.removeEventListener("storage", handleStorageChange);
       if (audioManagerRef.current) {
         audioManagerRef.current.cleanup();
       }
@@ -177,6 +177,7 @@ declare global {
         audioBlob: Blob | ArrayBuffer,
         options?: any
       ) => Promise<any>;
+      warmupLocalWhisper: (modelName: string) => Promise<any>;
       checkWhisperInstallation: () => Promise<WhisperCheckResult>;
       installWhisper: () => Promise<WhisperInstallResult>;
       onWhisperInstallProgress: (
@@ -9,12 +9,18 @@ import json
 import tempfile
 import os
 import argparse
+import contextlib
+import http.server
+import mmap
+import signal
+import socketserver
+import struct
+import urllib.parse
 from pathlib import Path
-import whisper
 import threading
 import time
-import requests
 import gc
+from collections import OrderedDict
 
 def get_ffmpeg_path():
     """Get path to bundled FFmpeg executable with proper production support"""
@@ -92,54 +98,917 @@ def get_ffmpeg_path():
     
     return None
 
-# Set FFmpeg path for Whisper
-ffmpeg_path = get_ffmpeg_path()
-if ffmpeg_path:
-    os.environ["FFMPEG_BINARY"] = ffmpeg_path
-    
-    # CRITICAL: Add ffmpeg directory to PATH so Whisper can find it
-    ffmpeg_dir = os.path.dirname(os.path.abspath(ffmpeg_path))
-    current_path = os.environ.get("PATH", "")
-    if ffmpeg_dir not in current_path:
-        os.environ["PATH"] = f"{ffmpeg_dir}{os.pathsep}{current_path}"
-    
-    # For Whisper library, we need to ensure 'ffmpeg' command works
-    # Create a symlink if needed (for macOS/Linux)
-    if sys.platform != "win32" and os.path.isfile(ffmpeg_path) and os.path.basename(ffmpeg_path) != "ffmpeg":
-        symlink_path = os.path.join(ffmpeg_dir, "ffmpeg")
-        if not os.path.exists(symlink_path):
-            try:
-                os.symlink(ffmpeg_path, symlink_path)
-            except Exception:
-                pass
+FFMPEG_ENV_VARS = ("FFMPEG_PATH", "FFMPEG_EXECUTABLE", "FFMPEG_BINARY")
 
-# Global model cache to avoid reloading
-_model_cache = {}
+def get_ffmpeg_cache_file():
+    """File the last FFmpeg resolution is persisted to between launches"""
+    return os.path.join(get_openwhispr_cache_dir(), "ffmpeg.json")
 
-def load_model(model_name="base"):
-    """Load Whisper model with caching for performance"""
-    global _model_cache
+def get_ffmpeg_version(ffmpeg_path):
+    """Return the first line of `ffmpeg -version`, or None if it does not run"""
+    import subprocess
+    try:
+        result = subprocess.run([ffmpeg_path, "-version"], capture_output=True, text=True, timeout=10)
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.split('\n')[0] if result.stdout else "Unknown"
+
+def resolve_ffmpeg(refresh=False):
+    """Find FFmpeg, reusing the persisted resolution while the binary is unchanged.
+    
+    Returns (path, version, cached). The cache entry is only trusted when the
+    lookup inputs (script location and FFMPEG_* overrides) match and a stat of
+    the binary still gives the recorded mtime and size, so a hit costs no
+    subprocess. refresh=True always searches again and rewrites the entry.
+    """
+    import shutil
+    
+    cache_file = get_ffmpeg_cache_file()
+    context = {
+        "script_dir": os.path.dirname(os.path.abspath(__file__)),
+        "overrides": {name: os.environ.get(name) for name in FFMPEG_ENV_VARS}
+    }
+    
+    if not refresh:
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            stat = os.stat(cached["resolved_path"])
+            if (cached["context"] == context and stat.st_mtime_ns == cached["mtime_ns"]
+                    and stat.st_size == cached["size"]):
+                return cached["path"], cached["version"], True
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    
+    ffmpeg_path = get_ffmpeg_path()
+    if not ffmpeg_path:
+        return None, None, False
+    version = get_ffmpeg_version(ffmpeg_path)
+    resolved_path = shutil.which(ffmpeg_path) or ffmpeg_path
+    if version is None or not os.path.isfile(resolved_path):
+        return ffmpeg_path, version, False
     
-    # Return cached model if available
-    if model_name in _model_cache:
-        return _model_cache[model_name]
+    try:
+        stat = os.stat(resolved_path)
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "path": ffmpeg_path,
+                "resolved_path": os.path.abspath(resolved_path),
+                "version": version,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "context": context
+            }, f)
+        os.replace(temp_path, cache_file)
+    except OSError as e:
+        print(f"Could not save FFmpeg resolution: {e}", file=sys.stderr)
+    
+    return ffmpeg_path, version, False
+
+# FFmpeg is located on first use; modes that never decode compressed audio skip the search
+_ffmpeg_path = None
+_ffmpeg_resolution = (None, None, False)
+_ffmpeg_configured = False
+_ffmpeg_lock = threading.Lock()
+
+def configure_ffmpeg(refresh=False):
+    """Find FFmpeg once and expose it to Whisper, returning its path (or None)"""
+    global _ffmpeg_path, _ffmpeg_resolution, _ffmpeg_configured
     
+    with _ffmpeg_lock:
+        if _ffmpeg_configured and not refresh:
+            return _ffmpeg_path
+        _ffmpeg_configured = True
+        
+        # Set FFmpeg path for Whisper
+        _ffmpeg_resolution = resolve_ffmpeg(refresh)
+        ffmpeg_path = _ffmpeg_path = _ffmpeg_resolution[0]
+        if ffmpeg_path:
+            os.environ["FFMPEG_BINARY"] = ffmpeg_path
+            
+            # CRITICAL: Add ffmpeg directory to PATH so Whisper can find it
+            ffmpeg_dir = os.path.dirname(os.path.abspath(ffmpeg_path))
+            current_path = os.environ.get("PATH", "")
+            if ffmpeg_dir not in current_path:
+                os.environ["PATH"] = f"{ffmpeg_dir}{os.pathsep}{current_path}"
+            
+            # For Whisper library, we need to ensure 'ffmpeg' command works
+            # Create a symlink if needed (for macOS/Linux)
+            if sys.platform != "win32" and os.path.isfile(ffmpeg_path) and os.path.basename(ffmpeg_path) != "ffmpeg":
+                symlink_path = os.path.join(ffmpeg_dir, "ffmpeg")
+                if not os.path.exists(symlink_path):
+                    try:
+                        os.symlink(ffmpeg_path, symlink_path)
+                    except Exception:
+                        pass
+        
+        return ffmpeg_path
+
+AVAILABLE_MODELS = ["tiny", "base", "small", "medium", "large", "turbo"]
+
+# Checkpoint file names in the Whisper cache (the basenames of whisper._MODELS URLs),
+# so status checks do not have to import whisper and torch
+MODEL_FILENAMES = {
+    "tiny": "tiny.pt",
+    "base": "base.pt",
+    "small": "small.pt",
+    "medium": "medium.pt",
+    "large": "large-v3.pt",
+    "turbo": "large-v3-turbo.pt"
+}
+
+# Default memory budget for resident models; fits turbo and base side by side
+DEFAULT_MODEL_CACHE_MB = 4096
+
+def estimate_model_bytes(model):
+    """Approximate resident size of a model from its parameter and buffer counts"""
     try:
-        model = whisper.load_model(model_name)
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    except Exception:
+        return 0
+
+class ModelCache:
+    """LRU cache of loaded models bounded by an approximate memory budget.
+    
+    Entries are keyed by (model, device, dtype, backend). Least recently used
+    entries are evicted once the summed entry sizes exceed budget_bytes, except
+    for pinned entries and the entry that was just inserted. on_evict(key,
+    model) is called for every evicted entry.
+    """
+    
+    def __init__(self, budget_bytes, on_evict=None):
+        self.budget_bytes = budget_bytes
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+        self._pinned = set()
+        # key -> {"done": Event, "error": Exception or None} for loads in progress
+        self._loading = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["model"]
+    
+    def get_or_load(self, key, load):
+        """Return the model for key, calling load() -> (model, size_bytes) on a miss.
+        
+        The cache lock is only held for the lookup and the insert, so stats
+        and pings are answered while a model loads or downloads. Concurrent
+        callers for the same key wait for that one load and share its result
+        or its error.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["model"]
+            loading = self._loading.get(key)
+            if loading is None:
+                self.misses += 1
+                loading = self._loading[key] = {"done": threading.Event(), "error": None}
+                owner = True
+            else:
+                owner = False
         
-        if len(_model_cache) >= 2:
-            oldest_key = next(iter(_model_cache))
-            del _model_cache[oldest_key]
+        if not owner:
+            loading["done"].wait()
+            if loading["error"] is not None:
+                raise loading["error"]
+            return self.get_or_load(key, load)
+        
+        try:
+            model, size_bytes = load()
+            self.put(key, model, size_bytes)
+            return model
+        except Exception as e:
+            loading["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            loading["done"].set()
+    
+    def put(self, key, model, size_bytes):
+        with self._lock:
+            self._entries[key] = {"model": model, "size_bytes": size_bytes}
+            self._entries.move_to_end(key)
+            self._evict(keep_key=key)
+    
+    def pin(self, key):
+        with self._lock:
+            self._pinned.add(key)
+    
+    def unpin(self, key):
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict()
+    
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+    
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry["size_bytes"] for entry in self._entries.values())
+    
+    def loaded_models(self):
+        with self._lock:
+            return [key[0] for key in self._entries]
+    
+    def _evict(self, keep_key=None):
+        evicted = False
+        for key in list(self._entries):
+            if self.total_bytes() <= self.budget_bytes:
+                break
+            if key == keep_key or key in self._pinned:
+                continue
+            entry = self._entries.pop(key)
+            if self.on_evict:
+                self.on_evict(key, entry["model"])
+            self.evictions += 1
+            evicted = True
+        if evicted:
             gc.collect()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": self.total_bytes(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": [
+                    {
+                        "model": key[0],
+                        "device": key[1],
+                        "dtype": key[2],
+                        "backend": key[3],
+                        "size_mb": round(entry["size_bytes"] / (1024 * 1024), 1),
+                        "pinned": key in self._pinned
+                    }
+                    # Most recently used first
+                    for key, entry in reversed(self._entries.items())
+                ]
+            }
+
+# Global model cache to avoid reloading
+_model_cache = ModelCache(
+    int(os.environ.get("OPENWHISPR_MODEL_CACHE_MB", DEFAULT_MODEL_CACHE_MB)) * 1024 * 1024,
+    on_evict=lambda key, model: get_backend(key[3]).unload(model)
+)
+
+def resolve_device(device=None):
+    """Resolve the device a model will be loaded on, preferring CUDA when available"""
+    if device:
+        return device
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+# Approximate parameter counts, for sizing models whose memory cannot be measured directly
+MODEL_PARAMETERS = {
+    "tiny": 39_000_000,
+    "base": 74_000_000,
+    "small": 244_000_000,
+    "medium": 769_000_000,
+    "large": 1_550_000_000,
+    "turbo": 809_000_000
+}
+
+class InferenceBackend:
+    """Interface for local inference engines.
+    
+    load() returns a model object whose transcribe(audio, **options) accepts
+    openai-whisper's transcribe options and returns a result dict shaped like
+    openai-whisper's ({"text", "language", "segments"}), so callers do not
+    need to know which engine produced it.
+    """
+    
+    name = None
+    compute_types = ()
+    # Whether log_mel() is implemented and its result is accepted by detect_language/transcribe
+    supports_mel = False
+    
+    def is_available(self):
+        raise NotImplementedError
+    
+    def resolve_device(self, device=None):
+        raise NotImplementedError
+    
+    def default_compute_type(self, device):
+        raise NotImplementedError
+    
+    def is_downloaded(self, model_name):
+        raise NotImplementedError
+    
+    def load(self, model_name, device, compute_type):
+        raise NotImplementedError
+    
+    def transcribe(self, model, audio, mel=None, **options):
+        return model.transcribe(audio, **options)
+    
+    def log_mel(self, model, audio):
+        """Compute the model's input features for the whole clip once"""
+        raise NotImplementedError
+    
+    def detect_language(self, model, audio, mel=None):
+        """Return (language, probability) for the first 30 seconds of audio"""
+        raise NotImplementedError
+    
+    def unload(self, model):
+        """Release engine resources held by a model the cache has dropped"""
+    
+    def estimate_bytes(self, model, model_name, compute_type):
+        bytes_per_parameter = 1 if compute_type.startswith("int8") else 2 if "16" in compute_type else 4
+        return MODEL_PARAMETERS.get(model_name, 0) * bytes_per_parameter
+    
+    def capabilities(self):
+        available = self.is_available()
+        return {
+            "available": available,
+            "compute_types": list(self.compute_types),
+            "default_compute_type": self.default_compute_type("cpu") if available else None
+        }
+
+# Thread settings requested with --threads / --interop-threads / --cpu-affinity or a
+# configure request; None leaves the library default in place
+_thread_config = {"threads": None, "interop_threads": None, "cpu_affinity": None}
+_torch_threads_applied = False
+
+def parse_cpu_list(spec):
+    """Parse a CPU list such as "0-3,6" into sorted CPU ids"""
+    cpus = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    if not cpus:
+        raise ValueError(f"Empty CPU list: {spec!r}")
+    return sorted(cpus)
+
+def available_cpu_count():
+    """CPUs this process may run on, honoring affinity where the platform reports it"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def set_process_affinity(cpus):
+    """Pin every thread of this process to cpus.
+    
+    sched_setaffinity(0) only changes the calling thread; threads that
+    already exist (the main thread, HTTP handlers, OpenMP and PyTorch pools)
+    keep their mask, so each one in /proc/self/task is updated. Threads
+    started later inherit the mask of the thread that creates them.
+    """
+    try:
+        thread_ids = [int(tid) for tid in os.listdir("/proc/self/task")]
+    except OSError:
+        thread_ids = [0]
+    for thread_id in thread_ids:
+        try:
+            os.sched_setaffinity(thread_id, cpus)
+        except ProcessLookupError:
+            # The thread exited in the meantime
+            pass
+
+def configure_threads(threads=None, interop_threads=None, cpu_affinity=None):
+    """Set CPU parallelism for local inference and return the effective settings.
+    
+    Before torch is imported the thread counts go into OMP_NUM_THREADS and
+    MKL_NUM_THREADS and are applied to torch when a model is loaded; after
+    that they are applied immediately. PyTorch only accepts an inter-op
+    thread count before its first parallel operation, so a late change raises
+    ValueError. cpu_affinity (a list of CPU ids) needs os.sched_setaffinity,
+    which is only available on Linux.
+    """
+    if cpu_affinity is not None:
+        if not hasattr(os, "sched_setaffinity"):
+            raise ValueError("CPU affinity is not supported on this platform")
+        set_process_affinity(cpu_affinity)
+        # The kernel silently drops CPUs that do not exist
+        _thread_config["cpu_affinity"] = sorted(os.sched_getaffinity(0))
+    if threads is not None:
+        if threads < 1:
+            raise ValueError("threads must be at least 1")
+        _thread_config["threads"] = threads
+        if "torch" not in sys.modules:
+            os.environ["OMP_NUM_THREADS"] = str(threads)
+            os.environ["MKL_NUM_THREADS"] = str(threads)
+    if interop_threads is not None:
+        if interop_threads < 1:
+            raise ValueError("interop_threads must be at least 1")
+        _thread_config["interop_threads"] = interop_threads
+    
+    if "torch" in sys.modules:
+        apply_torch_threads(force=True)
+    return thread_settings()
+
+def apply_torch_threads(force=False):
+    """Push the configured thread counts into torch (once, unless force)"""
+    global _torch_threads_applied
+    if _torch_threads_applied and not force:
+        return
+    _torch_threads_applied = True
+    
+    import torch
+    threads = _thread_config["threads"]
+    if threads is None and _thread_config["cpu_affinity"] is not None:
+        # Without an explicit count, size the pool to the pinned CPUs as torch does at startup
+        threads = len(_thread_config["cpu_affinity"])
+    if threads is not None:
+        torch.set_num_threads(threads)
+    interop_threads = _thread_config["interop_threads"]
+    if interop_threads is not None and torch.get_num_interop_threads() != interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            raise ValueError(f"Inter-op threads can no longer be changed in this process: {e}")
+
+def thread_settings():
+    """Effective thread counts and CPU affinity, for step metadata and configure responses"""
+    settings = {
+        "threads": _thread_config["threads"],
+        "interop_threads": _thread_config["interop_threads"],
+        "cpus": available_cpu_count()
+    }
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        settings["threads"] = torch.get_num_threads()
+        settings["interop_threads"] = torch.get_num_interop_threads()
+    if _thread_config["cpu_affinity"] is not None:
+        settings["cpu_affinity"] = _thread_config["cpu_affinity"]
+    return settings
+
+def module_bytes(model):
+    """Size of a module's state, including packed weights of quantized layers"""
+    total = 0
+    for value in model.state_dict().values():
+        tensors = value if isinstance(value, tuple) else (value,)
+        for tensor in tensors:
+            if hasattr(tensor, "element_size"):
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+def get_quantized_model_file(model_name):
+    """Where the int8 copy of a model is cached; pickled modules are tied to the torch version"""
+    import torch
+    torch_version = torch.__version__.split("+")[0]
+    return os.path.join(get_whisper_cache_dir(), "quantized", f"{model_name}-int8-torch{torch_version}.pt")
+
+def quantize_dynamic_int8(model):
+    """Replace a Whisper model's Linear layers with dynamically quantized int8 ones (CPU only)"""
+    import torch
+    
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            # quantize_dynamic matches exact module types, and Whisper uses its own Linear subclass
+            # that only adds a dtype cast
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+# Log-mel spectrograms computed ahead of whisper.transcribe(), per thread: (audio, mel)
+_mel_override = threading.local()
+_mel_hook_installed = False
+
+def _install_mel_hook():
+    """Route whisper.transcribe's log_mel_spectrogram call through precomputed_mel()"""
+    global _mel_hook_installed
+    if _mel_hook_installed:
+        return
+    import whisper  # noqa: F401 (loads whisper.transcribe)
+    transcribe_module = sys.modules["whisper.transcribe"]
+    original = transcribe_module.log_mel_spectrogram
+    
+    def log_mel_spectrogram(audio, *args, **kwargs):
+        override = getattr(_mel_override, "entry", None)
+        if override is not None and audio is override[0]:
+            return override[1]
+        return original(audio, *args, **kwargs)
+    
+    transcribe_module.log_mel_spectrogram = log_mel_spectrogram
+    _mel_hook_installed = True
+
+@contextlib.contextmanager
+def precomputed_mel(audio, mel):
+    """Make whisper.transcribe(audio) reuse mel instead of recomputing it (no-op when mel is None)"""
+    if mel is None:
+        yield
+        return
+    _install_mel_hook()
+    _mel_override.entry = (audio, mel)
+    try:
+        yield
+    finally:
+        _mel_override.entry = None
+
+# Default memory budget for cached encoder outputs (a 30s window is 3 MB for base, 7.5 MB for large)
+DEFAULT_ENCODER_CACHE_MB = 128
+
+class EncoderCache:
+    """LRU cache of audio encoder outputs bounded by a memory budget.
+    
+    Entries are keyed by the model object and a hash of the mel window fed to
+    the encoder, so re-decoding the same audio with another language, preset
+    or temperature only runs the decoder.
+    """
+    
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(model, mel):
+        import hashlib
+        import numpy as np
+        
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(str(tuple(mel.shape)).encode())
+        digest.update(memoryview(np.ascontiguousarray(mel.detach().cpu().numpy())).cast("B"))
+        return (id(model), digest.hexdigest())
+    
+    def get(self, key):
+        with self._lock:
+            features = self._entries.get(key)
+            if features is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return features
+    
+    def put(self, key, features):
+        size = features.numel() * features.element_size()
+        if size > self.budget_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = features
+            self._bytes += size
+            while self._bytes > self.budget_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.numel() * evicted.element_size()
+    
+    def drop_model(self, model):
+        """Forget every entry for a model that is being unloaded"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == id(model)]:
+                features = self._entries.pop(key)
+                self._bytes -= features.numel() * features.element_size()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": self._bytes,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+_encoder_cache = EncoderCache(
+    int(os.environ.get("OPENWHISPR_ENCODER_CACHE_MB", DEFAULT_ENCODER_CACHE_MB)) * 1024 * 1024
+)
+
+@contextlib.contextmanager
+def cached_encoder(model):
+    """Serve model.encoder calls from _encoder_cache for the duration of the block.
+    
+    Yields a dict counting this block's hits and misses.
+    """
+    from performance_logger import child_timer
+    
+    encoder = model.encoder
+    encode = encoder.forward
+    counts = {"hits": 0, "misses": 0}
+    
+    def forward(mel):
+        key = EncoderCache.key(model, mel)
+        features = _encoder_cache.get(key)
+        if features is not None:
+            counts["hits"] += 1
+            return features
+        counts["misses"] += 1
+        with child_timer("encoder"):
+            features = encode(mel)
+        _encoder_cache.put(key, features)
+        return features
+    
+    # An instance attribute shadows the class's forward() for nn.Module.__call__
+    encoder.forward = forward
+    try:
+        yield counts
+    finally:
+        del encoder.forward
+
+@contextlib.contextmanager
+def traced_decoding(model):
+    """Record each model.decode call (one per window and fallback temperature) as a child span"""
+    from performance_logger import child_timer
+    
+    decode = model.decode
+    
+    def traced(segment, options):
+        with child_timer("decode", temperature=options.temperature):
+            return decode(segment, options)
+    
+    model.decode = traced
+    try:
+        yield
+    finally:
+        del model.decode
+
+class PyTorchBackend(InferenceBackend):
+    """openai-whisper running on PyTorch"""
+    
+    name = "pytorch"
+    compute_types = ("float32", "float16", "int8")
+    supports_mel = True
+    
+    def is_available(self):
+        import importlib.util
+        return importlib.util.find_spec("whisper") is not None
+    
+    def resolve_device(self, device=None):
+        return resolve_device(device)
+    
+    def default_compute_type(self, device):
+        return "float32"
+    
+    def is_downloaded(self, model_name):
+        return os.path.exists(get_model_file(model_name))
+    
+    def load(self, model_name, device, compute_type):
+        import whisper
+        apply_torch_threads()
+        if compute_type == "int8":
+            return self._load_quantized(model_name, device)
+        model = whisper.load_model(model_name, device=device)
+        if compute_type == "float16":
+            model = model.half()
+        return model
+    
+    def log_mel(self, model, audio):
+        import whisper
+        # Same call (and 30s of trailing padding) as whisper.transcribe, so the result can stand in for it
+        return whisper.log_mel_spectrogram(audio, model.dims.n_mels, padding=whisper.audio.N_SAMPLES)
+    
+    def detect_language(self, model, audio, mel=None):
+        import whisper
+        if mel is None:
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels)
+        segment = whisper.pad_or_trim(mel, whisper.audio.N_FRAMES).to(model.device)
+        with cached_encoder(model):
+            _, probabilities = model.detect_language(segment)
+        language = max(probabilities, key=probabilities.get)
+        return language, probabilities[language]
+    
+    def transcribe(self, model, audio, mel=None, **options):
+        with precomputed_mel(audio, mel), cached_encoder(model) as encoder_counts, traced_decoding(model):
+            result = model.transcribe(audio, **options)
+        result["encoder_cache"] = encoder_counts
+        return result
+    
+    def _load_quantized(self, model_name, device):
+        """Load the int8 copy from disk, or quantize the float32 model and save it"""
+        import torch
+        import whisper
+        
+        if device != "cpu":
+            raise ValueError("int8 quantization is only supported on CPU")
+        
+        quantized_file = get_quantized_model_file(model_name)
+        source_file = get_model_file(model_name)
+        if os.path.exists(quantized_file) and (
+                not os.path.exists(source_file) or os.path.getmtime(quantized_file) >= os.path.getmtime(source_file)):
+            try:
+                # Written by _load_quantized below, so unpickling the whole module is safe
+                return torch.load(quantized_file, map_location="cpu", weights_only=False)
+            except Exception as e:
+                print(f"Ignoring unreadable quantized model {quantized_file}: {e}", file=sys.stderr)
+        
+        model = whisper.load_model(model_name, device="cpu")
+        size_before = module_bytes(model)
+        model = quantize_dynamic_int8(model)
+        model.quantization = {
+            "size_mb_before": round(size_before / (1024 * 1024), 1),
+            "size_mb_after": round(module_bytes(model) / (1024 * 1024), 1)
+        }
         
-        _model_cache[model_name] = model
+        try:
+            os.makedirs(os.path.dirname(quantized_file), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(quantized_file), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                torch.save(model, f)
+            os.replace(temp_path, quantized_file)
+        except OSError as e:
+            print(f"Could not save quantized model: {e}", file=sys.stderr)
         return model
+    
+    def unload(self, model):
+        _encoder_cache.drop_model(model)
+        try:
+            if next(model.parameters()).is_cuda:
+                import torch
+                # Give the weights back to the device instead of PyTorch's caching allocator
+                model.cpu()
+                torch.cuda.empty_cache()
+        except (StopIteration, AttributeError):
+            pass
+    
+    def estimate_bytes(self, model, model_name, compute_type):
+        if compute_type == "int8":
+            # Quantized weights are packed buffers that parameters() does not list
+            return module_bytes(model)
+        return estimate_model_bytes(model)
+
+# faster-whisper names of the converted CTranslate2 models
+FASTER_WHISPER_MODELS = {
+    "tiny": "tiny",
+    "base": "base",
+    "small": "small",
+    "medium": "medium",
+    "large": "large-v3",
+    "turbo": "large-v3-turbo"
+}
+
+# openai-whisper transcribe options with a faster-whisper equivalent
+FASTER_WHISPER_OPTIONS = {
+    "language": "language",
+    "task": "task",
+    "temperature": "temperature",
+    "initial_prompt": "initial_prompt",
+    "condition_on_previous_text": "condition_on_previous_text",
+    "beam_size": "beam_size",
+    "best_of": "best_of",
+    "patience": "patience",
+    "length_penalty": "length_penalty",
+    "compression_ratio_threshold": "compression_ratio_threshold",
+    "logprob_threshold": "log_prob_threshold",
+    "no_speech_threshold": "no_speech_threshold",
+    "word_timestamps": "word_timestamps",
+    "suppress_tokens": "suppress_tokens",
+    "without_timestamps": "without_timestamps"
+}
+
+class FasterWhisperModel:
+    """Adapter giving a faster-whisper model openai-whisper's transcribe() signature"""
+    
+    def __init__(self, model):
+        self.model = model
+    
+    def transcribe(self, audio, **options):
+        kwargs = {FASTER_WHISPER_OPTIONS[key]: value for key, value in options.items()
+                  if key in FASTER_WHISPER_OPTIONS and value is not None}
+        # openai-whisper decodes greedily unless a beam is requested; faster-whisper defaults to 5
+        kwargs.setdefault("beam_size", 1)
+        
+        ct2_model = self.model.model
+        if not getattr(ct2_model, "model_is_loaded", True):
+            # Unloaded after eviction while a caller still held it
+            ct2_model.load_model()
+        
+        segments, info = self.model.transcribe(audio, **kwargs)
+        segments = [
+            {
+                "id": index,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": list(segment.tokens),
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob
+            }
+            # The generator does the decoding, so this is where the time goes
+            for index, segment in enumerate(segments)
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "language": info.language,
+            "segments": segments
+        }
+
+class FasterWhisperBackend(InferenceBackend):
+    """faster-whisper running CTranslate2 models, with int8 inference on CPU"""
+    
+    name = "faster-whisper"
+    compute_types = ("int8", "int8_float16", "int8_float32", "int16", "float16", "float32")
+    
+    def is_available(self):
+        import importlib.util
+        return importlib.util.find_spec("faster_whisper") is not None
+    
+    def resolve_device(self, device=None):
+        if device:
+            return device
+        import ctranslate2
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    
+    def default_compute_type(self, device):
+        return "float16" if device == "cuda" else "int8"
+    
+    def model_dir(self, model_name):
+        return os.path.join(get_whisper_cache_dir(), "faster-whisper", FASTER_WHISPER_MODELS[model_name])
+    
+    def is_downloaded(self, model_name):
+        return os.path.exists(os.path.join(self.model_dir(model_name), "model.bin"))
+    
+    def load(self, model_name, device, compute_type):
+        from faster_whisper import WhisperModel, download_model
+        
+        model_dir = self.model_dir(model_name)
+        if not self.is_downloaded(model_name):
+            download_model(FASTER_WHISPER_MODELS[model_name], output_dir=model_dir)
+        # CTranslate2 fixes its thread count when the model is created; 0 means its default
+        return FasterWhisperModel(WhisperModel(model_dir, device=device, compute_type=compute_type,
+                                               cpu_threads=_thread_config["threads"] or 0))
+    
+    def detect_language(self, model, audio, mel=None):
+        language, probability, _ = model.model.detect_language(audio)
+        return language, probability
+    
+    def unload(self, model):
+        unload_model = getattr(model.model.model, "unload_model", None)
+        if unload_model:
+            unload_model()
+
+BACKENDS = {backend.name: backend for backend in (PyTorchBackend(), FasterWhisperBackend())}
+
+# Engine and compute type used when a caller does not ask for one (see --backend)
+_default_backend = os.environ.get("OPENWHISPR_BACKEND", "pytorch")
+_default_compute_type = None
+
+def get_backend(name=None):
+    backend = BACKENDS.get(name or _default_backend)
+    if backend is None:
+        raise ValueError(f"Unknown backend: {name}")
+    return backend
+
+def set_default_backend(name, compute_type=None):
+    """Select the engine (and optionally its compute type) for models loaded without one"""
+    global _default_backend, _default_compute_type
+    
+    backend = get_backend(name)
+    if compute_type is not None and compute_type not in backend.compute_types:
+        raise ValueError(f"Compute type {compute_type} is not supported by the {backend.name} backend "
+                         f"(choose from {', '.join(backend.compute_types)})")
+    _default_backend, _default_compute_type = backend.name, compute_type
+
+def model_cache_key(model_name, device=None, dtype=None, backend=None):
+    engine = get_backend(backend)
+    device = engine.resolve_device(device)
+    if dtype is None and engine.name == _default_backend:
+        dtype = _default_compute_type
+    return (model_name, device, dtype or engine.default_compute_type(device), engine.name)
+
+def load_model(model_name="base", device=None, dtype=None, backend=None):
+    """Load Whisper model with caching for performance"""
+    key = model_cache_key(model_name, device, dtype, backend)
+    engine = get_backend(key[3])
+    
+    def load():
+        model = engine.load(model_name, key[1], key[2])
+        return model, engine.estimate_bytes(model, model_name, key[2])
+    
+    try:
+        # Concurrent callers for the same key share one load
+        return _model_cache.get_or_load(key, load)
     except Exception as e:
+        print(f"Failed to load {model_name} with the {engine.name} backend: {e}", file=sys.stderr)
         return None
 
 def get_expected_model_size(model_name):
     """Get expected file size for a model by checking the remote URL"""
     try:
+        import requests
+        import whisper
         model_url = whisper._MODELS[model_name]
         response = requests.head(model_url, timeout=10)
         if response.status_code == 200:
@@ -164,15 +1033,252 @@ def get_whisper_cache_dir():
     default = os.path.join(os.path.expanduser("~"), ".cache")
     return os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper")
 
-def monitor_download_progress(model_name, expected_size, stop_event):
+def get_model_file(model_name):
+    """Path a model's checkpoint is (or will be) stored at in the Whisper cache"""
+    return os.path.join(get_whisper_cache_dir(), MODEL_FILENAMES[model_name])
+
+def get_openwhispr_cache_dir():
+    """Get the directory for OpenWhispr's own caches (next to Whisper's)"""
+    default = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.getenv("OPENWHISPR_CACHE_DIR") or os.path.join(os.getenv("XDG_CACHE_HOME", default), "openwhispr")
+
+# Default disk budget for cached transcription results
+DEFAULT_TRANSCRIPT_CACHE_MB = 64
+# Bump when the stored record format or the inputs to the key change
+TRANSCRIPT_CACHE_VERSION = 2
+
+class TranscriptCache:
+    """On-disk cache of transcription results keyed by audio content.
+    
+    Each entry is a small JSON file named after its key. File mtimes double
+    as the LRU order: hits touch the file, and the oldest files are removed
+    once the directory grows past budget_bytes.
+    """
+    
+    def __init__(self, directory, budget_bytes):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(audio, provider, model_name, language, **options):
+        """Hash audio (decoded samples or encoded bytes) with the settings that affect the text"""
+        import hashlib
+        import numpy as np
+        
+        digest = hashlib.blake2b(digest_size=20)
+        if isinstance(audio, np.ndarray):
+            digest.update(b"pcm:" + str(audio.dtype).encode())
+            digest.update(memoryview(np.ascontiguousarray(audio)).cast("B"))
+        else:
+            digest.update(b"bytes:")
+            digest.update(audio)
+        settings = {"version": TRANSCRIPT_CACHE_VERSION, "provider": provider, "model": model_name,
+                    "language": language or "", **options}
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            os.utime(path)
+            return record
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key, record):
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(record, f)
+                os.replace(temp_path, self._path(key))
+                self._evict()
+            except OSError as e:
+                print(f"Could not write transcription cache entry: {e}", file=sys.stderr)
+    
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.budget_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+_transcript_cache = TranscriptCache(
+    os.path.join(get_openwhispr_cache_dir(), "transcripts"),
+    int(os.environ.get("OPENWHISPR_TRANSCRIPT_CACHE_MB", DEFAULT_TRANSCRIPT_CACHE_MB)) * 1024 * 1024
+)
+
+# A language is pinned after this many consecutive confident detections agree
+LANGUAGE_PIN_DETECTIONS = 3
+LANGUAGE_PIN_PROBABILITY = 0.8
+# Detect again after this many clips decoded with the pinned language
+LANGUAGE_RECHECK_INTERVAL = 10
+# ...or straight away when a pinned clip decodes this badly (Whisper's own logprob_threshold)
+LANGUAGE_RECHECK_LOGPROB = -1.0
+LANGUAGE_HISTORY_SIZE = 10
+
+class LanguageHistory:
+    """Recently detected languages, persisted so dictation in one language skips detection.
+    
+    Once the last LANGUAGE_PIN_DETECTIONS detections agree with probability
+    of at least LANGUAGE_PIN_PROBABILITY, that language is pinned and used
+    instead of detecting. Detection runs again every LANGUAGE_RECHECK_INTERVAL
+    clips, or after a pinned clip with a poor average log-probability; a
+    confident disagreement unpins the language.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.detections = []
+        self.pinned = None
+        self.uses_since_check = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.detections = [tuple(entry) for entry in state.get("detections", [])][-LANGUAGE_HISTORY_SIZE:]
+            self.pinned = state.get("pinned")
+            self.uses_since_check = int(state.get("uses_since_check", 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+    
+    def pinned_language(self):
+        """The pinned language for the next clip, or None when it should be detected"""
+        with self._lock:
+            if self.pinned is None or self.uses_since_check >= LANGUAGE_RECHECK_INTERVAL:
+                return None
+            self.uses_since_check += 1
+            self._save()
+            return self.pinned
+    
+    def record_detection(self, language, probability):
+        with self._lock:
+            self.detections = (self.detections + [(language, round(float(probability), 3))])[-LANGUAGE_HISTORY_SIZE:]
+            confident = probability >= LANGUAGE_PIN_PROBABILITY
+            if self.pinned is not None and language != self.pinned and confident:
+                self.pinned = None
+            
+            recent = self.detections[-LANGUAGE_PIN_DETECTIONS:]
+            if (self.pinned is None and len(recent) == LANGUAGE_PIN_DETECTIONS
+                    and all(entry[0] == language and entry[1] >= LANGUAGE_PIN_PROBABILITY for entry in recent)):
+                self.pinned = language
+            self.uses_since_check = 0
+            self._save()
+    
+    def record_pinned_result(self, avg_logprob):
+        """Force a re-check when text decoded with the pinned language looks wrong"""
+        if avg_logprob is None or avg_logprob >= LANGUAGE_RECHECK_LOGPROB:
+            return
+        with self._lock:
+            self.uses_since_check = LANGUAGE_RECHECK_INTERVAL
+            self._save()
+    
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "detections": self.detections,
+                    "pinned": self.pinned,
+                    "uses_since_check": self.uses_since_check
+                }, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Could not save language history: {e}", file=sys.stderr)
+
+_language_history = None
+
+def get_language_history():
+    global _language_history
+    if _language_history is None:
+        _language_history = LanguageHistory(os.path.join(get_openwhispr_cache_dir(), "language_history.json"))
+    return _language_history
+
+def resolve_language(model, audio, mel=None, detect=None):
+    """Pick the language for a clip without one, from the history or by detection.
+    
+    detect(audio) -> (language, probability) replaces detection with the
+    local model, e.g. to run it in a worker process. Returns (language,
+    metadata) where metadata says which source was used.
+    """
+    history = get_language_history()
+    pinned = history.pinned_language()
+    if pinned is not None:
+        return pinned, {"source": "history", "language": pinned}
+    
+    if detect is not None:
+        language, probability = detect(audio)
+    else:
+        language, probability = get_backend().detect_language(model, audio, mel=mel)
+    history.record_detection(language, probability)
+    return language, {"source": "detected", "language": language, "probability": round(float(probability), 3)}
+
+def lookup_cached_transcription(perf_logger, cache_key):
+    """Return a finished transcription result for cache_key, or None on a miss.
+    
+    The lookup is logged as a result_cache step either way.
+    """
+    from performance_logger import StepTimer
+    
+    with StepTimer(perf_logger, "result_cache", hit=False) as cache_timer:
+        record = _transcript_cache.get(cache_key)
+        cache_timer.metadata["hit"] = record is not None
+    if record is None:
+        return None
+    
+    # Lets analyze_logs keep cache hits out of the latency and RTF figures
+    perf_logger.set_session_info(cached=True)
+    metrics = perf_logger.end_session(success=True)
+    return {
+        **record,
+        "cached": True,
+        "success": True,
+        "performance_metrics": {
+            "total_time_ms": metrics["total_time_ms"],
+            "file_size_mb": metrics["file_size_mb"],
+            "audio_duration_s": metrics.get("audio_duration_s"),
+            "rtf": metrics.get("rtf"),
+            "steps": metrics["steps"],
+            "breakdown_percent": metrics.get("breakdown_percent", {})
+        }
+    }
+
+def monitor_download_progress(model_name, expected_size, stop_event, download_timer=None):
     """Monitor download progress by watching file size growth"""
+    if download_timer is not None:
+        from performance_logger import StepTimer
+        
+        # Trace the monitor on its own thread, as part of the download
+        with StepTimer(download_timer.logger, "download_monitor", parent=download_timer,
+                       model=model_name) as monitor_timer:
+            monitor_timer.metadata["downloaded_bytes"] = monitor_download_progress(
+                model_name, expected_size, stop_event)
+        return
+    
     cache_dir = get_whisper_cache_dir()
-    model_url = whisper._MODELS[model_name]
-    model_file = os.path.join(cache_dir, os.path.basename(model_url))
+    model_file = get_model_file(model_name)
     
     os.makedirs(cache_dir, exist_ok=True)
     
     last_size = 0
+    current_size = 0
     last_update_time = time.time()
     speed_samples = []
     last_progress_update = 0
@@ -227,6 +1333,8 @@ def monitor_download_progress(model_name, expected_size, stop_event):
             pass
             
         time.sleep(0.5)
+    
+    return current_size
 
 def download_model(model_name="base"):
     """Download Whisper model with real-time progress monitoring"""
@@ -235,9 +1343,7 @@ def download_model(model_name="base"):
     
     try:
         # Check if model is already downloaded
-        cache_dir = get_whisper_cache_dir()
-        model_url = whisper._MODELS[model_name]
-        model_file = os.path.join(cache_dir, os.path.basename(model_url))
+        model_file = get_model_file(model_name)
         
         if os.path.exists(model_file):
             file_size = os.path.getsize(model_file)
@@ -253,23 +1359,33 @@ def download_model(model_name="base"):
         # Get expected file size
         expected_size = get_expected_model_size(model_name)
         
-        # Start progress monitoring in background thread
-        progress_thread = threading.Thread(
-            target=monitor_download_progress, 
-            args=(model_name, expected_size, stop_event),
-            daemon=True
-        )
-        progress_thread.start()
-        
-        # Start the actual download (this will block until complete)
-        model = whisper.load_model(model_name)
+        from performance_logger import PerformanceLogger, StepTimer
         
-        # Stop progress monitoring
-        stop_event.set()
+        perf_logger = PerformanceLogger(console_output=True)
+        perf_logger.start_session(f"download-{model_name}", file_size_bytes=expected_size, model=model_name,
+                                  kind="download")
         
-        # Wait for progress thread to finish
-        if progress_thread and progress_thread.is_alive():
-            progress_thread.join(timeout=1)
+        with StepTimer(perf_logger, "model_download", model=model_name) as download_timer:
+            # Start progress monitoring in background thread
+            progress_thread = threading.Thread(
+                target=monitor_download_progress, 
+                args=(model_name, expected_size, stop_event, download_timer),
+                name="download-monitor",
+                daemon=True
+            )
+            progress_thread.start()
+            
+            # Start the actual download (this will block until complete)
+            import whisper
+            model = whisper.load_model(model_name)
+            
+            # Stop progress monitoring
+            stop_event.set()
+            
+            # Wait for progress thread to finish
+            if progress_thread and progress_thread.is_alive():
+                progress_thread.join(timeout=1)
+        perf_logger.end_session(success=True)
         
         # Get final file info
         final_size = 0
@@ -297,6 +1413,8 @@ def download_model(model_name="base"):
         
     except KeyboardInterrupt:
         stop_event.set()
+        if 'perf_logger' in locals():
+            perf_logger.end_session(success=False, error="Download interrupted by user")
         return {
             "model": model_name,
             "downloaded": False,
@@ -305,6 +1423,8 @@ def download_model(model_name="base"):
         }
     except Exception as e:
         stop_event.set()
+        if 'perf_logger' in locals():
+            perf_logger.end_session(success=False, error=str(e))
         return {
             "model": model_name,
             "downloaded": False,
@@ -315,9 +1435,7 @@ def download_model(model_name="base"):
 def check_model_status(model_name="base"):
     """Check if a model is already downloaded"""
     try:
-        cache_dir = get_whisper_cache_dir()
-        model_url = whisper._MODELS[model_name]
-        model_file = os.path.join(cache_dir, os.path.basename(model_url))
+        model_file = get_model_file(model_name)
         
         if os.path.exists(model_file):
             file_size = os.path.getsize(model_file)
@@ -345,29 +1463,31 @@ def check_model_status(model_name="base"):
 
 def list_models():
     """List all available models and their download status"""
-    models = ["tiny", "base", "small", "medium", "large", "turbo"]
     model_info = []
     
-    for model in models:
+    for model in AVAILABLE_MODELS:
         status = check_model_status(model)
         model_info.append(status)
     
     return {
         "models": model_info,
         "cache_dir": get_whisper_cache_dir(),
+        "backends": {name: backend.capabilities() for name, backend in BACKENDS.items()},
+        "default_backend": _default_backend,
         "success": True
     }
 
 def delete_model(model_name="base"):
     """Delete a downloaded Whisper model"""
     try:
-        cache_dir = get_whisper_cache_dir()
-        model_url = whisper._MODELS[model_name]
-        model_file = os.path.join(cache_dir, os.path.basename(model_url))
+        model_file = get_model_file(model_name)
         
         if os.path.exists(model_file):
             file_size = os.path.getsize(model_file)
             os.remove(model_file)
+            # Quantized copies were derived from the deleted checkpoint
+            for quantized_file in Path(get_whisper_cache_dir(), "quantized").glob(f"{model_name}-int8-*.pt"):
+                quantized_file.unlink()
             return {
                 "model": model_name,
                 "deleted": True,
@@ -406,34 +1526,639 @@ def delete_model(model_name="base"):
             "success": False
         }
 
-def transcribe_audio(audio_path, model_name="base", language=None):
-    """Transcribe audio file using Whisper with optimizations and performance tracking"""
+# Whisper models operate on 16 kHz mono audio
+WHISPER_SAMPLE_RATE = 16000
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def parse_wav_header(data):
+    """Locate the fmt and data chunks of a RIFF/WAVE byte string.
     
-    if not os.path.exists(audio_path):
-        return {"error": f"Audio file not found: {audio_path}", "success": False}
+    Returns a dict with format_tag, channels, sample_rate, bits_per_sample,
+    data_offset and data_length, or None if the bytes are not a WAV file.
+    """
+    if len(data) < 12 or data[0:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
     
-    try:
-        # Import performance logger
-        from performance_logger import PerformanceLogger, StepTimer
-        
-        # Initialize performance logger
-        perf_logger = PerformanceLogger(console_output=True)
-        perf_logger.start_session(audio_path)
+    header = {}
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", data, offset + 4)[0]
+        body = offset + 8
         
-        # Check for Groq API Key
-        groq_api_key = os.environ.get("GROQ_API_KEY")
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", data, body)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # The real format is the first two bytes of the SubFormat GUID
+                format_tag = struct.unpack_from("<H", data, body + 24)[0]
+            header.update({
+                "format_tag": format_tag,
+                "channels": channels,
+                "sample_rate": sample_rate,
+                "bits_per_sample": bits
+            })
+        elif chunk_id == b"data":
+            # Streamed writers may leave the size as 0 or 0xFFFFFFFF
+            available = len(data) - body
+            if chunk_size == 0 or chunk_size > available:
+                chunk_size = available
+            header["data_offset"] = body
+            header["data_length"] = chunk_size
+            break
         
-        # PREFER GROQ if key is present (Cloud Acceleration)
+        # Chunks are padded to an even number of bytes
+        offset = body + chunk_size + (chunk_size & 1)
+    
+    if "format_tag" not in header or "data_offset" not in header:
+        return None
+    return header
+
+def pcm_to_float32(raw, format_tag, bits_per_sample, channels):
+    """Convert interleaved PCM bytes to a mono float32 array in [-1, 1], or None if unsupported"""
+    import numpy as np
+    
+    if format_tag == WAVE_FORMAT_PCM:
+        if bits_per_sample == 16:
+            samples = np.frombuffer(raw, dtype="<i2", count=len(raw) // 2).astype(np.float32) / 32768.0
+        elif bits_per_sample == 8:
+            samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        elif bits_per_sample == 24:
+            triplets = np.frombuffer(raw, dtype=np.uint8, count=len(raw) // 3 * 3).reshape(-1, 3).astype(np.int32)
+            values = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2] << 16)
+            values = np.where(values & 0x800000, values - 0x1000000, values)
+            samples = values.astype(np.float32) / 8388608.0
+        elif bits_per_sample == 32:
+            samples = np.frombuffer(raw, dtype="<i4", count=len(raw) // 4).astype(np.float32) / 2147483648.0
+        else:
+            return None
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        if bits_per_sample == 32:
+            # No copy for little-endian float32 input
+            samples = np.frombuffer(raw, dtype="<f4", count=len(raw) // 4).astype(np.float32, copy=False)
+        elif bits_per_sample == 64:
+            samples = np.frombuffer(raw, dtype="<f8", count=len(raw) // 8).astype(np.float32)
+        else:
+            return None
+    else:
+        return None
+    
+    if channels > 1:
+        usable = len(samples) - len(samples) % channels
+        samples = samples[:usable].reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return samples
+
+def resample_audio(samples, source_rate, target_rate=WHISPER_SAMPLE_RATE):
+    """Resample a float32 signal, averaging for integer ratios and interpolating otherwise"""
+    import numpy as np
+    
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    
+    if source_rate % target_rate == 0:
+        # Block averaging doubles as a cheap anti-aliasing filter
+        factor = source_rate // target_rate
+        usable = len(samples) - len(samples) % factor
+        return samples[:usable].reshape(-1, factor).mean(axis=1, dtype=np.float32)
+    
+    ratio = source_rate / target_rate
+    if ratio >= 1.5:
+        width = int(round(ratio))
+        samples = np.convolve(samples, np.full(width, 1.0 / width, dtype=np.float32), mode="same")
+    
+    output_length = int(round(len(samples) / ratio))
+    positions = np.arange(output_length, dtype=np.float64) * ratio
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+def decode_wav_bytes(data):
+    """Decode PCM or float WAV bytes to 16 kHz mono float32, or None if ffmpeg is needed"""
+    header = parse_wav_header(data)
+    if header is None or header["channels"] < 1:
+        return None
+    
+    raw = memoryview(data)[header["data_offset"]:header["data_offset"] + header["data_length"]]
+    samples = pcm_to_float32(raw, header["format_tag"], header["bits_per_sample"], header["channels"])
+    if samples is None:
+        return None
+    return resample_audio(samples, header["sample_rate"])
+
+def audio_source_info(data=None, pcm=None):
+    """Describe audio as received: sample_rate, channels and, for WAV, duration_s.
+    
+    Only reads container headers; values that need a full decode are None.
+    """
+    if pcm is not None and pcm.get("format") != "wav":
+        return {"sample_rate": int(pcm.get("sample_rate") or 0) or None, "channels": int(pcm.get("channels") or 1)}
+    
+    data = pcm["data"] if pcm is not None else data
+    try:
+        header = parse_wav_header(data) if data else None
+    except struct.error:
+        header = None
+    if header is None or not header["sample_rate"] or not header["channels"] or not header["bits_per_sample"]:
+        return {}
+    
+    frame_bytes = header["channels"] * header["bits_per_sample"] // 8
+    return {
+        "duration_s": header["data_length"] / frame_bytes / header["sample_rate"] if frame_bytes else None,
+        "sample_rate": header["sample_rate"],
+        "channels": header["channels"]
+    }
+
+def decode_audio_bytes(data, audio_path=None):
+    """Decode audio bytes for Whisper, bypassing ffmpeg for PCM WAV input.
+    
+    Returns (samples, decoder) where decoder is "native" or "ffmpeg".
+    """
+    try:
+        samples = decode_wav_bytes(data)
+    except (struct.error, ValueError):
+        samples = None
+    
+    if samples is not None:
+        return samples, "native"
+    
+    if audio_path is None:
+        raise ValueError("Only PCM or float WAV audio can be decoded without a file")
+    
+    # Compressed or unusual formats still go through ffmpeg
+    configure_ffmpeg()
+    import whisper
+    return whisper.load_audio(audio_path), "ffmpeg"
+
+# Raw sample formats accepted from clients that stream audio without a file
+PCM_SAMPLE_FORMATS = {
+    "s16le": (WAVE_FORMAT_PCM, 16),
+    "f32le": (WAVE_FORMAT_IEEE_FLOAT, 32),
+}
+
+def read_exact(stream, length):
+    """Read exactly length bytes from a binary stream into a writable buffer"""
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    received = 0
+    while received < length:
+        count = stream.readinto(view[received:])
+        if not count:
+            raise EOFError(f"Expected {length} bytes of audio, received {received}")
+        received += count
+    return buffer
+
+class RequestError(ValueError):
+    """A client request that cannot be served as sent; status is the HTTP status to report"""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def validate_pcm_payload(pcm):
+    """Check that a client's pcm dict carries non-empty raw bytes, and return them"""
+    if not isinstance(pcm, dict):
+        raise RequestError("pcm must be an object")
+    data = pcm.get("data")
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        # JSON can only carry text; raw audio has to follow the request line or be the HTTP body
+        raise RequestError("PCM data must be raw bytes")
+    if not len(data):
+        raise RequestError("PCM payload is empty")
+    return data
+
+def decode_pcm_payload(pcm):
+    """Wrap raw audio sent by a client as 16 kHz mono float32.
+    
+    pcm is a dict with "data" (bytes-like), "format" (s16le, f32le or wav),
+    and for raw formats "sample_rate" and optionally "channels". Mono f32le
+    at 16 kHz is wrapped with numpy.frombuffer without copying.
+    """
+    data = validate_pcm_payload(pcm)
+    sample_format = pcm.get("format") or "s16le"
+    if sample_format == "wav":
+        samples = decode_wav_bytes(data)
+        if samples is None:
+            raise RequestError("Unsupported WAV payload; only PCM and float WAV can be sent inline")
+        return samples
+    
+    if sample_format not in PCM_SAMPLE_FORMATS:
+        raise RequestError(f"Unsupported PCM format: {sample_format}")
+    
+    try:
+        sample_rate = int(pcm.get("sample_rate") or 0)
+        channels = int(pcm.get("channels") or 1)
+    except (TypeError, ValueError):
+        raise RequestError("sample_rate and channels must be integers")
+    if sample_rate <= 0:
+        raise RequestError("sample_rate is required for raw PCM audio")
+    if channels <= 0:
+        raise RequestError("channels must be positive")
+    
+    format_tag, bits = PCM_SAMPLE_FORMATS[sample_format]
+    if len(data) < bits // 8 * channels:
+        raise RequestError("PCM payload is shorter than one sample frame")
+    samples = pcm_to_float32(memoryview(data), format_tag, bits, channels)
+    return resample_audio(samples, sample_rate)
+
+def encode_wav_bytes(samples, sample_rate=WHISPER_SAMPLE_RATE):
+    """Encode float32 mono samples as an in-memory 16-bit PCM WAV file"""
+    import numpy as np
+    
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, WAVE_FORMAT_PCM, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", len(pcm)
+    )
+    return header + pcm
+
+# Voice activity detection tuning
+VAD_FRAME_MS = 30
+VAD_PADDING_MS = 240
+VAD_MAX_PAUSE_MS = 600
+VAD_MIN_SPEECH_MS = 90
+# A clip is treated as pure silence only if no frame reaches this level (dBFS)
+VAD_SILENCE_DBFS = -50.0
+# Frames analyzed at a time (about a minute), so long clips don't need
+# several full-length temporaries
+VAD_BLOCK_FRAMES = 2048
+
+def detect_speech_frames(audio, sample_rate=WHISPER_SAMPLE_RATE, frame_ms=VAD_FRAME_MS):
+    """Classify fixed-size frames as speech using frame energy and spectral flatness.
+    
+    The energy threshold adapts to the clip: it sits between the noise floor
+    (10th percentile) and the loud frames (95th percentile). Frames above it
+    count as speech if their spectrum is tonal (low flatness) or if they are
+    clearly louder than the threshold. Returns (mask, frame_length, peak_dbfs)
+    or (None, frame_length, peak_dbfs) if the clip has too little contrast to
+    classify safely; peak_dbfs is the level of the loudest frame.
+    """
+    import numpy as np
+    
+    frame_length = int(sample_rate * frame_ms / 1000)
+    frame_count = len(audio) // frame_length
+    if frame_count == 0:
+        return None, frame_length, 0.0
+    
+    frames = audio[:frame_count * frame_length].reshape(frame_count, frame_length)
+    blocks = range(0, frame_count, VAD_BLOCK_FRAMES)
+    energy_db = np.empty(frame_count)
+    for start in blocks:
+        block = frames[start:start + VAD_BLOCK_FRAMES]
+        energy_db[start:start + len(block)] = 10.0 * np.log10(np.mean(block ** 2, axis=1) + 1e-10)
+    noise_floor = float(np.percentile(energy_db, 10))
+    peak = float(np.percentile(energy_db, 95))
+    # A single short word can sit above the 95th percentile, so silence is judged on the loudest frame
+    loudest = float(np.max(energy_db))
+    
+    if loudest < VAD_SILENCE_DBFS:
+        return np.zeros(frame_count, dtype=bool), frame_length, loudest
+    if peak - noise_floor < 6.0:
+        # Continuous speech, steady noise or a brief sound in a quiet clip; trimming would be guesswork
+        return None, frame_length, loudest
+    
+    threshold = noise_floor + max(6.0, 0.3 * (peak - noise_floor))
+    
+    window = np.hanning(frame_length)
+    flatness = np.empty(frame_count)
+    for start in blocks:
+        block = frames[start:start + VAD_BLOCK_FRAMES]
+        power = np.abs(np.fft.rfft(block * window, axis=1)) ** 2 + 1e-12
+        flatness[start:start + len(block)] = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    
+    loud = energy_db > threshold
+    return loud & ((flatness < 0.5) | (energy_db > threshold + 10.0)), frame_length, loudest
+
+def apply_vad(audio, sample_rate=WHISPER_SAMPLE_RATE):
+    """Trim leading/trailing silence and shorten long pauses before decoding.
+    
+    Returns (audio, info, speech_mask) where info holds the original and
+    trimmed durations in seconds and the number of speech regions that were
+    kept, and speech_mask classifies the frames of the returned audio (for
+    split_on_silence, so it need not analyze the clip again).
+    """
+    import numpy as np
+    
+    original_s = round(len(audio) / sample_rate, 2)
+    mask, frame_length, peak = detect_speech_frames(audio, sample_rate)
+    if mask is None:
+        # Too little contrast to find pauses; treat every frame as speech
+        speech_mask = np.ones(len(audio) // frame_length, dtype=bool)
+        return audio, {"original_s": original_s, "trimmed_s": original_s, "speech_regions": None}, speech_mask
+    
+    # Drop speech runs too short to be a word, then pad the remaining ones
+    min_frames = max(1, VAD_MIN_SPEECH_MS // VAD_FRAME_MS)
+    padding = VAD_PADDING_MS // VAD_FRAME_MS
+    regions = []
+    start = None
+    for index, is_speech in enumerate(np.append(mask, False)):
+        if is_speech and start is None:
+            start = index
+        elif not is_speech and start is not None:
+            if index - start >= min_frames:
+                regions.append([max(0, start - padding), min(len(mask), index + padding)])
+            start = None
+    
+    if not regions and peak >= VAD_SILENCE_DBFS:
+        # Something audible that didn't look like speech; let the model decide rather than drop it
+        speech_mask = np.ones(len(audio) // frame_length, dtype=bool)
+        return audio, {"original_s": original_s, "trimmed_s": original_s, "speech_regions": None}, speech_mask
+    if not regions:
+        return audio[:0], {"original_s": original_s, "trimmed_s": 0.0, "speech_regions": 0}, mask[:0]
+    
+    # Merge regions that overlap after padding
+    merged = [regions[0]]
+    for region in regions[1:]:
+        if region[0] <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], region[1])
+        else:
+            merged.append(region)
+    
+    max_pause = int(sample_rate * VAD_MAX_PAUSE_MS / 1000)
+    # Whole frames, so every piece starts on a frame boundary and the mask can follow it
+    half_pause = max_pause // 2 // frame_length * frame_length
+    pieces = []
+    for index, (first_frame, last_frame) in enumerate(merged):
+        region_end = len(audio) if last_frame == len(mask) else last_frame * frame_length
+        pieces.append((first_frame * frame_length, region_end))
+        if index + 1 < len(merged):
+            # Keep the edges of long pauses so words are not glued together
+            gap_start = region_end
+            gap_end = merged[index + 1][0] * frame_length
+            if gap_end - gap_start > max_pause:
+                pieces.append((gap_start, gap_start + half_pause))
+                pieces.append((gap_end - half_pause, gap_end))
+            else:
+                pieces.append((gap_start, gap_end))
+    
+    trimmed = np.concatenate([audio[start:end] for start, end in pieces])
+    speech_mask = np.concatenate([mask[start // frame_length:end // frame_length] for start, end in pieces])
+    return trimmed, {
+        "original_s": original_s,
+        "trimmed_s": round(len(trimmed) / sample_rate, 2),
+        "speech_regions": len(merged)
+    }, speech_mask
+
+# Audio shorter than this is never split across worker processes
+LONG_AUDIO_MIN_SECONDS = 120
+LONG_AUDIO_CHUNK_SECONDS = 60
+LONG_AUDIO_MAX_CHUNK_SECONDS = 90
+# Overlap added when a chunk has to be cut where nobody paused
+LONG_AUDIO_OVERLAP_SECONDS = 1.0
+
+def split_on_silence(audio, sample_rate=WHISPER_SAMPLE_RATE, target_seconds=LONG_AUDIO_CHUNK_SECONDS,
+                     max_seconds=LONG_AUDIO_MAX_CHUNK_SECONDS, overlap_seconds=LONG_AUDIO_OVERLAP_SECONDS,
+                     speech_mask=None):
+    """Split audio into chunks of roughly target_seconds, cutting inside pauses.
+    
+    speech_mask is the per-frame classification from apply_vad(); without it
+    the audio is analyzed here. Returns a list of (start_sample, end_sample,
+    overlaps_previous). A chunk only overlaps the previous one when no pause
+    was found before max_seconds and the cut had to be made mid-speech.
+    """
+    import numpy as np
+    
+    if speech_mask is not None:
+        mask, frame_length = speech_mask, int(sample_rate * VAD_FRAME_MS / 1000)
+    else:
+        mask, frame_length, _ = detect_speech_frames(audio, sample_rate)
+    if mask is None:
+        silent_frames = np.zeros(0, dtype=int)
+    else:
+        silent_frames = np.flatnonzero(~mask)
+    
+    target = int(target_seconds * sample_rate)
+    longest = int(max_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    
+    chunks = []
+    start = 0
+    overlaps_previous = False
+    while len(audio) - start > longest:
+        # Pick the pause closest to the target length within [target / 2, max]
+        low = (start + target // 2) // frame_length
+        high = (start + longest) // frame_length
+        candidates = silent_frames[(silent_frames >= low) & (silent_frames < high)]
+        if len(candidates):
+            best = candidates[np.argmin(np.abs(candidates * frame_length - (start + target)))]
+            end = int(best * frame_length + frame_length // 2)
+            chunks.append((start, end, overlaps_previous))
+            start, overlaps_previous = end, False
+        else:
+            end = start + longest
+            chunks.append((start, end, overlaps_previous))
+            start, overlaps_previous = end - overlap, True
+    chunks.append((start, len(audio), overlaps_previous))
+    return chunks
+
+def _normalize_word(word):
+    return "".join(ch for ch in word.lower() if ch.isalnum())
+
+def merge_chunk_texts(texts, overlaps, max_overlap_words=12):
+    """Join chunk transcripts in order, dropping words repeated across an overlap"""
+    merged = []
+    for text, overlaps_previous in zip(texts, overlaps):
+        words = text.split()
+        if overlaps_previous and merged and words:
+            previous = [_normalize_word(w) for w in merged[-max_overlap_words:]]
+            current = [_normalize_word(w) for w in words[:max_overlap_words]]
+            for size in range(min(len(previous), len(current)), 0, -1):
+                if previous[-size:] == current[:size]:
+                    words = words[size:]
+                    break
+        merged.extend(words)
+    return " ".join(merged)
+
+# Decoding options layered over openai-whisper's transcribe() defaults
+DECODING_PRESETS = {
+    # One greedy pass per window: no temperature fallback re-decodes, no prompt from earlier windows
+    "fast": {"temperature": 0.0, "condition_on_previous_text": False},
+    # openai-whisper's defaults: greedy, re-decoding with rising temperatures when output looks wrong
+    "balanced": {},
+    # Beam search, as in the whisper command line tool
+    "accurate": {"beam_size": 5, "best_of": 5}
+}
+DEFAULT_DECODING_PRESET = "balanced"
+
+def decoding_options(preset=None):
+    """Transcribe options for a named decoding preset"""
+    preset = preset or DEFAULT_DECODING_PRESET
+    if preset not in DECODING_PRESETS:
+        raise ValueError(f"Unknown decoding preset: {preset} (choose from {', '.join(DECODING_PRESETS)})")
+    return dict(DECODING_PRESETS[preset])
+
+# Worker processes shared by long-audio and batch transcription
+_worker_model = None
+_worker_pool = None
+_worker_pool_key = None
+
+def _init_worker(model_name, threads, backend, compute_type):
+    global _worker_model
+    configure_threads(threads=threads)
+    set_default_backend(backend, compute_type)
+    _worker_model = load_model(model_name)
+
+def _transcribe_chunk(index, samples, language, preset):
+    options = {"fp16": False, "verbose": None, **decoding_options(preset)}
+    if language:
+        options["language"] = language
+    # perf_counter_ns is system-wide, so the parent can place this span on its timeline
+    timing = {"start_ns": time.perf_counter_ns(), "cpu_start_ns": time.process_time_ns()}
+    result = _worker_model.transcribe(samples, **options)
+    timing.update(end_ns=time.perf_counter_ns(), cpu_ns=time.process_time_ns() - timing.pop("cpu_start_ns"),
+                  pid=os.getpid())
+    logprobs = [segment["avg_logprob"] for segment in result.get("segments") or []]
+    timing["avg_logprob"] = sum(logprobs) / len(logprobs) if logprobs else None
+    return index, result.get("text", "").strip(), result.get("language"), timing
+
+def _detect_chunk_language(samples):
+    language, probability = get_backend().detect_language(_worker_model, samples)
+    return language, float(probability)
+
+def _get_worker_pool(model_name, workers):
+    """Return a worker pool with the model loaded, reusing it across requests"""
+    global _worker_pool, _worker_pool_key
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+    
+    pool_key = (model_name, workers, _default_backend, _default_compute_type)
+    if _worker_pool is not None and _worker_pool_key != pool_key:
+        _worker_pool.shutdown(wait=True)
+        _worker_pool = None
+    
+    if _worker_pool is None:
+        # Split the cores between workers instead of every worker using all of them
+        threads = _thread_config["threads"] or max(1, available_cpu_count() // workers)
+        _worker_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            # Forking a process that already initialized torch threads can deadlock
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, threads, _default_backend, _default_compute_type)
+        )
+        _worker_pool_key = pool_key
+    return _worker_pool
+
+def transcribe_long_audio(audio, model_name="base", language=None, workers=2, preset=None, speech_mask=None):
+    """Transcribe long audio by splitting it on pauses and decoding chunks in parallel.
+    
+    Each worker process holds its own copy of the model. Without a language,
+    it is resolved once (history, or detection on the first chunk in a
+    worker) and used for every chunk so they agree. Returns a result dict
+    shaped like model.transcribe() output plus the chunk count, the mean
+    avg_logprob and, when resolved here, language_info. speech_mask is the
+    frame classification from apply_vad(), reused to find the pauses.
+    """
+    from performance_logger import child_timer, record_child_span
+    
+    chunks = split_on_silence(audio, speech_mask=speech_mask)
+    pool = _get_worker_pool(model_name, workers)
+    
+    language_info = None
+    if not language:
+        first_start, first_end, _ = chunks[0]
+        with child_timer("language_detection"):
+            language, language_info = resolve_language(
+                None, audio[first_start:first_end],
+                detect=lambda samples: pool.submit(_detect_chunk_language, samples).result()
+            )
+    
+    futures = [
+        pool.submit(_transcribe_chunk, index, audio[start:end], language, preset)
+        for index, (start, end, _) in enumerate(chunks)
+    ]
+    
+    texts = [""] * len(chunks)
+    logprobs = []
+    for future in futures:
+        index, text, _, timing = future.result()
+        start, end, _ = chunks[index]
+        record_child_span("chunk", timing["start_ns"], timing["end_ns"], timing["cpu_ns"],
+                          thread_id=timing["pid"], thread_name=f"worker-{timing['pid']}",
+                          index=index, audio_s=round((end - start) / WHISPER_SAMPLE_RATE, 2))
+        texts[index] = text
+        if timing["avg_logprob"] is not None:
+            logprobs.append(timing["avg_logprob"])
+    
+    return {
+        "text": merge_chunk_texts(texts, [overlaps for _, _, overlaps in chunks]),
+        "language": language or "unknown",
+        "chunks": len(chunks),
+        "avg_logprob": round(sum(logprobs) / len(logprobs), 3) if logprobs else None,
+        "language_info": language_info
+    }
+
+def transcribe_audio(audio_path, model_name="base", language=None, pcm=None, vad=True, workers=1,
+                     use_cache=True, preset=None):
+    """Transcribe audio file using Whisper with optimizations and performance tracking
+    
+    When pcm is given (see decode_pcm_payload) the audio comes from memory and
+    audio_path is only used as a label for logging. With vad enabled, silence
+    is trimmed from the decoded audio before local decoding (see apply_vad).
+    With workers > 1, audio longer than LONG_AUDIO_MIN_SECONDS is split on
+    pauses and decoded in parallel (see transcribe_long_audio). Unless
+    use_cache is False, results are looked up in and saved to the on-disk
+    transcript cache, keyed by the audio content and settings. preset picks
+    the local decoding strategy (see DECODING_PRESETS).
+    """
+    
+    if pcm is None and not os.path.exists(audio_path):
+        return {"error": f"Audio file not found: {audio_path}", "success": False}
+    
+    preset = preset or DEFAULT_DECODING_PRESET
+    if preset not in DECODING_PRESETS:
+        return {"error": f"Unknown decoding preset: {preset}", "success": False}
+    
+    try:
+        # Import performance logger
+        from performance_logger import PerformanceLogger, StepTimer
+        
+        if pcm is not None:
+            validate_pcm_payload(pcm)
+        
+        # Initialize performance logger
+        perf_logger = PerformanceLogger(console_output=True)
+        if pcm is None:
+            # Read the file once; both Groq and the local decoder use these bytes
+            with open(audio_path, "rb") as f:
+                audio_bytes = f.read()
+        else:
+            audio_bytes = bytes(pcm["data"]) if pcm.get("format") == "wav" else None
+        perf_logger.start_session(audio_path, file_size_bytes=len(pcm["data"]) if pcm else len(audio_bytes),
+                                  model=model_name, provider="local")
+        perf_logger.set_audio_info(**audio_source_info(audio_bytes, pcm))
+        
+        audio = None
+        if pcm is not None:
+            with StepTimer(perf_logger, "audio_decoding", decoder="pcm", format=pcm.get("format") or "s16le"):
+                audio = decode_pcm_payload(pcm)
+            perf_logger.set_audio_info(duration_s=len(audio) / WHISPER_SAMPLE_RATE)
+        
+        # Check for Groq API Key
+        groq_api_key = os.environ.get("GROQ_API_KEY")
+        
+        # PREFER GROQ if key is present (Cloud Acceleration)
         if groq_api_key:
             try:
                 from groq import Groq
                 
-                with StepTimer(perf_logger, "groq_client_init"):
-                    client = Groq(api_key=groq_api_key)
-                
                 # Use large-v3-turbo for Groq by default if not specified or if local model name passed
                 # If user selected "turbo" locally, mapped to "whisper-large-v3-turbo"
                 groq_model = "whisper-large-v3-turbo"
+                perf_logger.set_session_info(model=groq_model, provider="groq")
+                
+                if audio_bytes is None:
+                    audio_bytes = encode_wav_bytes(audio)
+                
+                if use_cache:
+                    # Key on the uploaded bytes so a hit does not need a local decode
+                    cache_key = TranscriptCache.key(audio_bytes, "groq", groq_model, language)
+                    cached = lookup_cached_transcription(perf_logger, cache_key)
+                    if cached is not None:
+                        return cached
+                
+                with StepTimer(perf_logger, "groq_client_init"):
+                    client = Groq(api_key=groq_api_key)
                 
                 options = {
                     "model": groq_model,
@@ -444,17 +2169,21 @@ def transcribe_audio(audio_path, model_name="base", language=None):
                     options["language"] = language
                 
                 with StepTimer(perf_logger, "groq_transcription", model=groq_model):
-                    with open(audio_path, "rb") as file:
-                        transcription = client.audio.transcriptions.create(
-                            file=(os.path.basename(audio_path), file.read()),
-                            **options
-                        )
+                    transcription = client.audio.transcriptions.create(
+                        file=(os.path.basename(audio_path) if pcm is None else "audio.wav", audio_bytes),
+                        **options
+                    )
                 
                 text = transcription.text.strip()
                 # Groq generic response might not have language detected in simple JSON, 
                 # but let's try to get it if verbose_json was used (we used json here for speed)
                 detected_language = language or "unknown" 
                 
+                if use_cache and text:
+                    _transcript_cache.put(cache_key, {
+                        "text": text, "language": detected_language, "provider": "groq", "model": groq_model
+                    })
+                
                 metrics = perf_logger.end_session(success=True)
                 
                 return {
@@ -466,6 +2195,8 @@ def transcribe_audio(audio_path, model_name="base", language=None):
                     "performance_metrics": {
                         "total_time_ms": metrics["total_time_ms"],
                         "file_size_mb": metrics["file_size_mb"],
+                        "audio_duration_s": metrics.get("audio_duration_s"),
+                        "rtf": metrics.get("rtf"),
                         "steps": metrics["steps"],
                         "breakdown_percent": metrics.get("breakdown_percent", {})
                     }
@@ -478,27 +2209,107 @@ def transcribe_audio(audio_path, model_name="base", language=None):
                 # Fallthrough to local whisper
         
         # LOCAL WHISPER FALLBACK
+        perf_logger.set_session_info(model=model_name, provider="local")
         
-        # Load model (uses cache for performance)
-        with StepTimer(perf_logger, "model_loading", model=model_name):
-            model = load_model(model_name)
-            if model is None:
-                perf_logger.end_session(success=False, error="Failed to load Whisper model")
-                return {"error": "Failed to load Whisper model", "success": False}
+        # Decode once up front so Whisper does not spawn ffmpeg for WAV input
+        if audio is None:
+            with StepTimer(perf_logger, "audio_decoding") as decode_timer:
+                audio, decoder = decode_audio_bytes(audio_bytes, audio_path)
+                decode_timer.metadata["decoder"] = decoder
+            perf_logger.set_audio_info(duration_s=len(audio) / WHISPER_SAMPLE_RATE)
         
-        options = {
-            "fp16": False,
-            "verbose": False,
-        }
-        if language:
-            options["language"] = language
+        if use_cache:
+            # Key on the decoded samples so the same clip hits regardless of container.
+            # Chunked long-audio results are stitched differently from single-pass ones;
+            # VAD only shortens audio, so clips below the threshold here are never chunked.
+            chunked = workers > 1 and len(audio) >= LONG_AUDIO_MIN_SECONDS * WHISPER_SAMPLE_RATE
+            cache_key = TranscriptCache.key(audio, "local", model_name, language, vad=bool(vad),
+                                            backend=_default_backend, compute_type=_default_compute_type,
+                                            preset=preset, chunked=chunked)
+            cached = lookup_cached_transcription(perf_logger, cache_key)
+            if cached is not None:
+                return cached
+        
+        speech_mask = None
+        if vad:
+            with StepTimer(perf_logger, "vad") as vad_timer:
+                audio, vad_info, speech_mask = apply_vad(audio)
+                vad_timer.metadata.update(vad_info)
+        
+        if len(audio) == 0:
+            # Nothing but silence: skip loading and running the model entirely
+            result = {"text": "", "language": language or "unknown"}
+        elif workers > 1 and len(audio) >= LONG_AUDIO_MIN_SECONDS * WHISPER_SAMPLE_RATE:
+            with StepTimer(perf_logger, "transcription", model=model_name, workers=workers,
+                           preset=preset) as transcription_timer:
+                result = transcribe_long_audio(audio, model_name, language, workers, preset, speech_mask)
+                transcription_timer.metadata["chunks"] = result["chunks"]
+                if result["avg_logprob"] is not None:
+                    transcription_timer.metadata["avg_logprob"] = result["avg_logprob"]
+                if result["language_info"]:
+                    transcription_timer.metadata["language_source"] = result["language_info"]["source"]
+            if result["language_info"] and result["language_info"]["source"] == "history":
+                get_language_history().record_pinned_result(result["avg_logprob"])
+        else:
+            # Load model (uses cache for performance)
+            with StepTimer(perf_logger, "model_loading", model=model_name, backend=_default_backend) as load_timer:
+                model = load_model(model_name)
+                if model is None:
+                    perf_logger.end_session(success=False, error="Failed to load Whisper model")
+                    return {"error": "Failed to load Whisper model", "success": False}
+                compute_type = model_cache_key(model_name)[2]
+                load_timer.metadata["compute_type"] = compute_type
+                # Size before/after for quantized models, to weigh against the accuracy below
+                load_timer.metadata.update(getattr(model, "quantization", {}))
+            
+            engine = get_backend()
+            mel = None
+            if engine.supports_mel:
+                # One spectrogram feeds both language detection and every decoding window
+                with StepTimer(perf_logger, "mel_spectrogram") as mel_timer:
+                    mel = engine.log_mel(model, audio)
+                    mel_timer.metadata["frames"] = int(mel.shape[-1])
+            
+            decode_language, language_source = language, None
+            if not language:
+                # Reuse the user's usual language instead of detecting it on every clip
+                with StepTimer(perf_logger, "language_detection") as language_timer:
+                    decode_language, language_info = resolve_language(model, audio, mel)
+                    language_source = language_info["source"]
+                    language_timer.metadata.update(language_info)
+            
+            options = {
+                "fp16": False,
+                "verbose": False,
+                **decoding_options(preset)
+            }
+            if decode_language:
+                options["language"] = decode_language
+                
+            with StepTimer(perf_logger, "transcription", model=model_name, backend=_default_backend,
+                           compute_type=compute_type, preset=preset, **thread_settings()) as transcription_timer:
+                result = engine.transcribe(model, audio, mel=mel, **options)
+                if "encoder_cache" in result:
+                    transcription_timer.metadata["encoder_cache_hits"] = result["encoder_cache"]["hits"]
+                    transcription_timer.metadata["encoder_cache_misses"] = result["encoder_cache"]["misses"]
+                segments = result.get("segments") or []
+                if segments:
+                    # Mean token log-probability: a cheap accuracy proxy for comparing compute types
+                    transcription_timer.metadata["avg_logprob"] = round(
+                        sum(segment["avg_logprob"] for segment in segments) / len(segments), 3)
             
-        with StepTimer(perf_logger, "transcription", model=model_name):
-            result = model.transcribe(audio_path, **options)
+            if language_source == "history":
+                get_language_history().record_pinned_result(transcription_timer.metadata.get("avg_logprob"))
         
         text = result.get("text", "").strip()
         detected_language = result.get("language", "unknown")
         
+        # Empty text may come from a wrong VAD verdict; don't pin it for every retry
+        if use_cache and text:
+            _transcript_cache.put(cache_key, {
+                "text": text, "language": detected_language, "provider": "local", "model": model_name
+            })
+        
         metrics = perf_logger.end_session(success=True)
         
         return {
@@ -506,10 +2317,14 @@ def transcribe_audio(audio_path, model_name="base", language=None):
             "language": detected_language,
             "provider": "local",
             "model": model_name,
+            "backend": _default_backend,
+            "preset": preset,
             "success": True,
             "performance_metrics": {
                 "total_time_ms": metrics["total_time_ms"],
                 "file_size_mb": metrics["file_size_mb"],
+                "audio_duration_s": metrics.get("audio_duration_s"),
+                "rtf": metrics.get("rtf"),
                 "steps": metrics["steps"],
                 "breakdown_percent": metrics.get("breakdown_percent", {})
             }
@@ -522,18 +2337,466 @@ def transcribe_audio(audio_path, model_name="base", language=None):
                 perf_logger.end_session(success=False, error=str(e))
         except:
             pass
+        if isinstance(e, RequestError):
+            # Undecodable inline audio is the client's mistake; status lets serve mode report it as such
+            return {"error": str(e), "status": e.status, "success": False}
             
         return {
             "error": str(e),
             "success": False
         }
 
-def check_ffmpeg():
-    """Check if FFmpeg is available and working"""
+# Length of the silent clip used to trigger lazy initialization during warm-up
+WARMUP_AUDIO_SECONDS = 1.0
+
+def warmup_model(model_name="base"):
+    """Load a model and run a short silent clip through it so the first real transcription is fast"""
+    if not get_backend().is_downloaded(model_name):
+        # Warm-up must never trigger a multi-gigabyte download as a side effect
+        return {"model": model_name, "error": "Model not downloaded", "success": False}
+    
+    try:
+        import numpy as np
+        from performance_logger import PerformanceLogger, StepTimer
+        
+        perf_logger = PerformanceLogger(console_output=True)
+        perf_logger.start_session(f"warmup-{model_name}", model=model_name, provider="local", kind="warmup")
+        
+        with StepTimer(perf_logger, "model_loading", model=model_name, backend=_default_backend):
+            model = load_model(model_name)
+        if model is None:
+            perf_logger.end_session(success=False, error="Failed to load Whisper model")
+            return {"model": model_name, "error": "Failed to load Whisper model", "success": False}
+        
+        # A single greedy pass over silence initializes kernels and allocators
+        # without the temperature fallback ladder re-decoding it
+        silence = np.zeros(int(16000 * WARMUP_AUDIO_SECONDS), dtype=np.float32)
+        with StepTimer(perf_logger, "warmup_inference", model=model_name, **thread_settings()):
+            model.transcribe(silence, fp16=False, verbose=False, temperature=0.0,
+                             condition_on_previous_text=False)
+        
+        metrics = perf_logger.end_session(success=True)
+        return {
+            "model": model_name,
+            "warmed_up": True,
+            "load_time_ms": metrics["steps"]["model_loading"]["duration_ms"],
+            "warmup_time_ms": metrics["steps"]["warmup_inference"]["duration_ms"],
+            "success": True,
+            "performance_metrics": {
+                "total_time_ms": metrics["total_time_ms"],
+                "steps": metrics["steps"],
+                "breakdown_percent": metrics.get("breakdown_percent", {})
+            }
+        }
+    except Exception as e:
+        try:
+            if 'perf_logger' in locals():
+                perf_logger.end_session(success=False, error=str(e))
+        except:
+            pass
+        
+        return {"model": model_name, "error": str(e), "success": False}
+
+AUDIO_FILE_EXTENSIONS = {".wav", ".mp3", ".m4a", ".webm", ".ogg", ".flac", ".mp4", ".aac", ".opus"}
+
+def collect_batch_files(paths, manifest=None):
+    """Expand audio paths, directories and an optional manifest into a list of files.
+    
+    Directories are searched recursively for known audio extensions. The
+    manifest is a text file with one path per line; blank lines and lines
+    starting with # are ignored.
+    """
+    entries = list(paths or [])
+    if manifest:
+        with open(manifest, "r", encoding="utf-8") as f:
+            entries.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+    
+    files = []
+    seen = set()
+    for entry in entries:
+        if os.path.isdir(entry):
+            found = []
+            for root, _, names in os.walk(entry):
+                found.extend(os.path.join(root, name) for name in names
+                             if os.path.splitext(name)[1].lower() in AUDIO_FILE_EXTENSIONS)
+            candidates = sorted(found)
+        else:
+            candidates = [entry]
+        for candidate in candidates:
+            key = os.path.abspath(candidate)
+            if key not in seen:
+                seen.add(key)
+                files.append(candidate)
+    return files
+
+def load_batch_checkpoint(output_path):
+    """Return absolute paths already transcribed successfully in a JSON Lines output file"""
+    done = set()
+    if not output_path or not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run
+                continue
+            if isinstance(record, dict) and record.get("success") and record.get("audio_file"):
+                done.add(os.path.abspath(record["audio_file"]))
+    return done
+
+def _transcribe_batch_file(audio_path, model_name, language, vad, use_cache, preset):
+    return transcribe_audio(audio_path, model_name, language, vad=vad, use_cache=use_cache, preset=preset)
+
+def transcribe_batch(audio_files, model_name="base", language=None, output_path=None,
+                     workers=1, vad=True, use_cache=True, preset=None):
+    """Transcribe many files with one model load, writing a JSON Lines record per file.
+    
+    Records are appended to output_path (or printed to stdout) as each file
+    completes, so an interrupted run can be resumed: files that already have
+    a successful record in output_path are skipped. With workers > 1 the files
+    are spread over worker processes that each load the model once.
+    """
+    from concurrent.futures import as_completed
+    from performance_logger import summarize_sessions
+    
+    batch_start = time.time()
+    done = load_batch_checkpoint(output_path)
+    pending = [path for path in audio_files if os.path.abspath(path) not in done]
+    
+    output = open(output_path, "a", encoding="utf-8") if output_path else sys.stdout
+    sessions = []
+    
+    def record(audio_path, result):
+        output.write(json.dumps({"audio_file": os.path.abspath(audio_path), **result}) + "\n")
+        output.flush()
+        session = dict(result.get("performance_metrics") or {})
+        session["success"] = bool(result.get("success"))
+        sessions.append(session)
+    
+    try:
+        if workers > 1 and len(pending) > 1:
+            pool = _get_worker_pool(model_name, workers)
+            futures = {
+                pool.submit(_transcribe_batch_file, path, model_name, language, vad, use_cache, preset): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": str(e), "success": False}
+                record(futures[future], result)
+        else:
+            for path in pending:
+                record(path, transcribe_audio(path, model_name, language, vad=vad, use_cache=use_cache,
+                                              preset=preset))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    wall_time_ms = (time.time() - batch_start) * 1000
+    stats = summarize_sessions(sessions)
+    return {
+        "success": all(session["success"] for session in sessions),
+        "files": len(audio_files),
+        "skipped": len(audio_files) - len(pending),
+        "transcribed": sum(1 for session in sessions if session["success"]),
+        "failed": sum(1 for session in sessions if not session["success"]),
+        "workers": workers,
+        "wall_time_ms": round(wall_time_ms, 2),
+        "files_per_minute": round(len(sessions) / (wall_time_ms / 60000), 2) if sessions and wall_time_ms > 0 else 0,
+        "performance_stats": stats
+    }
+
+def emit_partial(event):
+    """Report an incremental streaming result on stderr, like PROGRESS: lines"""
+    print(f"PARTIAL:{json.dumps(event)}", file=sys.stderr, flush=True)
+
+class StreamingTranscriber:
+    """Incrementally transcribes audio that is pushed while the user is speaking.
+    
+    Every step_seconds of new audio, the window that starts at the last
+    committed position is decoded. Segments ending at least holdback_seconds
+    before the end of the window are stable: their text is committed and the
+    window start moves past them. Later segments are reported as unstable and
+    re-decoded next time. On finish() only the uncommitted tail is decoded,
+    so the latency after the user stops speaking is roughly one window.
+    """
+    
+    def __init__(self, stream_id, model_name="base", language=None, sample_format="s16le",
+                 sample_rate=WHISPER_SAMPLE_RATE, channels=1, step_seconds=1.0,
+                 holdback_seconds=1.5, max_window_seconds=24.0, on_partial=emit_partial):
+        if sample_format not in PCM_SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported PCM format for streaming: {sample_format}")
+        
+        from performance_logger import PerformanceLogger
+        
+        self.stream_id = stream_id
+        self.model_name = model_name
+        self.language = language
+        self.sample_format = sample_format
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.step_samples = int(step_seconds * WHISPER_SAMPLE_RATE)
+        self.holdback_seconds = holdback_seconds
+        self.max_window_samples = int(max_window_seconds * WHISPER_SAMPLE_RATE)
+        self.on_partial = on_partial
+        
+        self.frame_bytes = PCM_SAMPLE_FORMATS[sample_format][1] // 8 * self.channels
+        self._remainder = b""
+        self._chunks = []
+        self._total_samples = 0
+        self._committed_samples = 0
+        self._decoded_samples = 0
+        self._committed_text = []
+        self._unstable_text = ""
+        self._window_decodes = 0
+        self._decode_pending = False
+        self._finished = False
+        # _lock guards the audio buffer and is only held briefly, so pushes never
+        # wait for inference; _decode_lock serializes decodes and owns the commit state
+        self._lock = threading.RLock()
+        self._decode_lock = threading.Lock()
+        
+        self.perf_logger = PerformanceLogger(console_output=False)
+        self.perf_logger.start_session(f"stream-{stream_id}", file_size_bytes=0, model=model_name, provider="local",
+                                       kind="stream")
+        self.perf_logger.set_audio_info(sample_rate=self.sample_rate, channels=self.channels)
+    
+    def push_bytes(self, data):
+        """Append raw PCM bytes; partial frames are kept until the next chunk"""
+        import numpy as np
+        
+        with self._lock:
+            if self._finished:
+                raise ValueError(f"Stream {self.stream_id} has already ended")
+            
+            data = self._remainder + bytes(data)
+            usable = len(data) - len(data) % self.frame_bytes
+            self._remainder = data[usable:]
+            if not usable:
+                return
+            
+            pcm = {
+                "data": data[:usable],
+                "format": self.sample_format,
+                "sample_rate": self.sample_rate,
+                "channels": self.channels
+            }
+            samples = decode_pcm_payload(pcm)
+            self._chunks.append(np.asarray(samples, dtype=np.float32))
+            self._total_samples += len(samples)
+    
+    def needs_decode(self):
+        """Whether enough new audio arrived for another window decode"""
+        with self._lock:
+            return (not self._finished and not self._decode_pending and
+                    self._total_samples - self._decoded_samples >= self.step_samples)
+    
+    def mark_decode_pending(self):
+        with self._lock:
+            self._decode_pending = True
+    
+    def _audio(self):
+        import numpy as np
+        
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+    
+    def _decode(self, audio):
+        model = load_model(self.model_name)
+        if model is None:
+            raise RuntimeError("Failed to load Whisper model")
+        
+        options = {
+            "fp16": False,
+            "verbose": None,
+            "temperature": 0.0,
+            "condition_on_previous_text": False
+        }
+        if self.language:
+            options["language"] = self.language
+        if self._committed_text:
+            # Give the decoder the committed text as context for the next window
+            options["initial_prompt"] = " ".join(self._committed_text)[-200:]
+        
+        result = model.transcribe(audio, **options)
+        if not self.language and result.get("language"):
+            # Keep the detected language for later windows so they agree
+            self.language = result["language"]
+        return result
+    
+    def decode_window(self):
+        """Decode the uncommitted window, commit stable segments and emit a partial"""
+        with self._decode_lock:
+            with self._lock:
+                self._decode_pending = False
+                if self._finished:
+                    return None
+                audio = self._audio()
+                # Later pushes replace the consolidated buffer instead of writing into it
+                window = audio[self._committed_samples:]
+                total_samples = len(audio)
+            if len(window) == 0:
+                return None
+            
+            started_at = time.time()
+            result = self._decode(window)
+            decode_ms = (time.time() - started_at) * 1000
+            self._window_decodes += 1
+            with self._lock:
+                self._decoded_samples = total_samples
+            
+            window_seconds = len(window) / WHISPER_SAMPLE_RATE
+            segments = result.get("segments") or []
+            stable_until = window_seconds - self.holdback_seconds
+            stable = [seg for seg in segments if seg["end"] <= stable_until]
+            if not stable and len(window) >= self.max_window_samples and segments:
+                # Never let the window grow past what one decoder pass covers
+                stable = segments[:-1] or segments
+            
+            if stable:
+                self._committed_text.extend(seg["text"].strip() for seg in stable if seg["text"].strip())
+                committed_end = min(stable[-1]["end"], window_seconds)
+                self._committed_samples += int(committed_end * WHISPER_SAMPLE_RATE)
+            
+            unstable = segments[len(stable):]
+            self._unstable_text = " ".join(seg["text"].strip() for seg in unstable if seg["text"].strip())
+            
+            self.perf_logger.log_step("window_decode", decode_ms, window_s=round(window_seconds, 2))
+            event = {
+                "type": "partial",
+                "stream_id": self.stream_id,
+                "stable": " ".join(self._committed_text),
+                "unstable": self._unstable_text,
+                "audio_seconds": round(total_samples / WHISPER_SAMPLE_RATE, 2),
+                "decode_ms": round(decode_ms, 2)
+            }
+        if self.on_partial:
+            self.on_partial(event)
+        return event
+    
+    def finish(self):
+        """Decode the remaining tail and return the final transcription result"""
+        with self._decode_lock:
+            try:
+                with self._lock:
+                    # Refuse further pushes; a queued window decode now does nothing
+                    self._finished = True
+                    tail = self._audio()[self._committed_samples:]
+                text_parts = list(self._committed_text)
+                
+                # Skip decoding tails too short to contain a word
+                if len(tail) >= WHISPER_SAMPLE_RATE // 10:
+                    started_at = time.time()
+                    result = self._decode(tail)
+                    self.perf_logger.log_step(
+                        "final_decode", (time.time() - started_at) * 1000,
+                        tail_s=round(len(tail) / WHISPER_SAMPLE_RATE, 2),
+                        window_decodes=self._window_decodes
+                    )
+                    tail_text = result.get("text", "").strip()
+                    if tail_text:
+                        text_parts.append(tail_text)
+                
+                self.perf_logger.set_audio_info(duration_s=self._total_samples / WHISPER_SAMPLE_RATE)
+                metrics = self.perf_logger.end_session(success=True)
+                return {
+                    "stream_id": self.stream_id,
+                    "text": " ".join(text_parts).strip(),
+                    "language": self.language or "unknown",
+                    "provider": "local",
+                    "model": self.model_name,
+                    "audio_seconds": round(self._total_samples / WHISPER_SAMPLE_RATE, 2),
+                    "success": True,
+                    "performance_metrics": {
+                        "total_time_ms": metrics["total_time_ms"],
+                        "audio_duration_s": metrics.get("audio_duration_s"),
+                        "rtf": metrics.get("rtf"),
+                        "steps": metrics["steps"],
+                        "breakdown_percent": metrics.get("breakdown_percent", {})
+                    }
+                }
+            except Exception as e:
+                self._finished = True
+                self.perf_logger.end_session(success=False, error=str(e))
+                return {"stream_id": self.stream_id, "error": str(e), "success": False}
+
+def transcribe_stream(input_stream, model_name="base", language=None):
+    """Transcribe a PCM stream read from a binary file object until EOF.
+    
+    The stream starts with one JSON header line ({"format", "sample_rate",
+    "channels"}); partial results are emitted as PARTIAL: lines on stderr.
+    Window decodes run on a background thread so reading never waits for them.
+    """
+    header = json.loads(input_stream.readline())
+    if not isinstance(header, dict):
+        raise ValueError("Stream header must be a JSON object")
+    
+    stream = StreamingTranscriber(
+        "stdin", model_name, language,
+        sample_format=header.get("format") or "s16le",
+        sample_rate=header.get("sample_rate") or WHISPER_SAMPLE_RATE,
+        channels=header.get("channels") or 1
+    )
+    
+    decode_wanted = threading.Event()
+    reading = [True]
+    
+    def decode_loop():
+        while True:
+            decode_wanted.wait()
+            decode_wanted.clear()
+            if not reading[0]:
+                return
+            try:
+                stream.decode_window()
+            except Exception as e:
+                print(f"Window decode failed: {e}", file=sys.stderr)
+    
+    decoder = threading.Thread(target=decode_loop, name="stream-decoder", daemon=True)
+    decoder.start()
+    
+    read_chunk = getattr(input_stream, "read1", input_stream.read)
+    try:
+        while True:
+            chunk = read_chunk(65536)
+            if not chunk:
+                break
+            stream.push_bytes(chunk)
+            if stream.needs_decode():
+                stream.mark_decode_pending()
+                decode_wanted.set()
+    finally:
+        reading[0] = False
+        decode_wanted.set()
+        decoder.join()
+    
+    return stream.finish()
+
+def check_ffmpeg(refresh=False):
+    """Check if FFmpeg is available and working
+    
+    Uses the persisted resolution when the binary is unchanged (see
+    resolve_ffmpeg); refresh=True searches and runs it again.
+    """
     try:
         import subprocess
-        test_path = ffmpeg_path or "ffmpeg"
+        test_path = configure_ffmpeg(refresh) or "ffmpeg"
+        _, version, cached = _ffmpeg_resolution
+        if version is not None:
+            return {
+                "available": True,
+                "path": test_path,
+                "version": version,
+                "cached": cached,
+                "success": True
+            }
         
+        # Not resolved: run it directly to report why
+
         result = subprocess.run([test_path, "-version"], 
                               capture_output=True, text=True, timeout=10)
         
@@ -570,21 +2833,687 @@ def check_ffmpeg():
             "success": False
         }
 
+def _daemon_model(request):
+    """Validate the model requested by a daemon client"""
+    model_name = request.get("model") or "base"
+    if model_name not in AVAILABLE_MODELS:
+        raise RequestError(f"Unknown model: {model_name}", status=404)
+    return model_name
+
+def _daemon_transcribe(request):
+    model_name = _daemon_model(request)
+    preset = request.get("preset")
+    if preset and preset not in DECODING_PRESETS:
+        raise RequestError(f"Unknown decoding preset: {preset}")
+    try:
+        workers = int(request.get("workers") or 1)
+    except (TypeError, ValueError):
+        raise RequestError(f"Invalid workers value: {request.get('workers')}")
+    options = {"vad": request.get("vad", True), "workers": workers,
+               "use_cache": request.get("cache", True), "preset": preset}
+    
+    pcm = request.get("pcm")
+    if pcm is not None:
+        if isinstance(pcm, dict) and "data" not in pcm:
+            raise RequestError("PCM audio payload is missing")
+        return transcribe_audio("<pcm>", model_name, request.get("language"), pcm=pcm, **options)
+    
+    audio_path = request.get("audio_path")
+    if not audio_path:
+        raise RequestError("audio_path or pcm is required for transcribe requests")
+    if not os.path.exists(audio_path):
+        raise RequestError(f"Audio file not found: {audio_path}", status=404)
+    return transcribe_audio(audio_path, model_name, request.get("language"), **options)
+
+def _daemon_ping(request):
+    return {
+        "pid": os.getpid(),
+        "loaded_models": _model_cache.loaded_models(),
+        "success": True
+    }
+
+def _daemon_metrics(request):
+    return {
+        "metrics": _daemon_metrics_collector.snapshot(),
+        "queue_depth": _get_scheduler().depth(),
+        "model_cache": _model_cache.stats(),
+        "encoder_cache": _encoder_cache.stats(),
+        "success": True
+    }
+
+def _daemon_pin(request):
+    """Load a model if needed and keep it resident until it is unpinned"""
+    model_name = _daemon_model(request)
+    key = model_cache_key(model_name, request.get("device"), request.get("dtype"), request.get("backend"))
+    _model_cache.pin(key)
+    if load_model(*key) is None:
+        _model_cache.unpin(key)
+        return {"model": model_name, "error": "Failed to load Whisper model", "success": False}
+    return {"model": model_name, "pinned": True, "model_cache": _model_cache.stats(), "success": True}
+
+def _daemon_configure(request):
+    """Change thread counts and CPU affinity for subsequent transcriptions"""
+    cpu_affinity = request.get("cpu_affinity")
+    if isinstance(cpu_affinity, str):
+        cpu_affinity = parse_cpu_list(cpu_affinity)
+    settings = configure_threads(request.get("threads"), request.get("interop_threads"), cpu_affinity)
+    return {"threads": settings, "success": True}
+
+def _daemon_unpin(request):
+    model_name = _daemon_model(request)
+    _model_cache.unpin(model_cache_key(model_name, request.get("device"), request.get("dtype"), request.get("backend")))
+    return {"model": model_name, "pinned": False, "model_cache": _model_cache.stats(), "success": True}
+
+# Open streaming sessions in serve mode, keyed by client-chosen stream_id
+_streams = {}
+_streams_lock = threading.Lock()
+
+def _get_stream(request):
+    with _streams_lock:
+        stream = _streams.get(request.get("stream_id"))
+    if stream is None:
+        raise RequestError(f"Unknown stream: {request.get('stream_id')}", status=404)
+    return stream
+
+def _daemon_stream_start(request):
+    stream_id = request.get("stream_id")
+    if stream_id is None:
+        raise RequestError("stream_id is required")
+    
+    stream = StreamingTranscriber(
+        stream_id, _daemon_model(request), request.get("language"),
+        sample_format=request.get("format") or "s16le",
+        sample_rate=request.get("sample_rate") or WHISPER_SAMPLE_RATE,
+        channels=request.get("channels") or 1,
+        # serve_stdio attaches a callback that sends partials to the client
+        on_partial=request.get("on_partial") or emit_partial
+    )
+    with _streams_lock:
+        if stream_id in _streams:
+            raise RequestError(f"Stream already exists: {stream_id}", status=409)
+        _streams[stream_id] = stream
+    return {"stream_id": stream_id, "success": True}
+
+def _daemon_stream_chunk(request):
+    stream = _get_stream(request)
+    pcm = request.get("pcm") or {}
+    if "data" not in pcm:
+        raise RequestError("PCM audio payload is missing")
+    
+    stream.push_bytes(pcm["data"])
+    if stream.needs_decode():
+        # Window decodes share the scheduler (and the model) with other requests
+        stream.mark_decode_pending()
+        _get_scheduler().submit({"type": "stream_decode", "stream_id": stream.stream_id})
+    return {"stream_id": stream.stream_id, "success": True}
+
+def _daemon_stream_decode(request):
+    with _streams_lock:
+        stream = _streams.get(request.get("stream_id"))
+    # The stream may have ended while this decode was queued
+    event = stream.decode_window() if stream else None
+    return {"partial": event, "success": True}
+
+def _daemon_stream_end(request):
+    stream = _get_stream(request)
+    with _streams_lock:
+        _streams.pop(stream.stream_id, None)
+    return stream.finish()
+
+# Request handlers available in serve mode, keyed by request "type"
+DAEMON_HANDLERS = {
+    "transcribe": _daemon_transcribe,
+    "check": lambda request: check_model_status(_daemon_model(request)),
+    "list": lambda request: list_models(),
+    "download": lambda request: download_model(_daemon_model(request)),
+    "delete": lambda request: delete_model(_daemon_model(request)),
+    "check-ffmpeg": lambda request: check_ffmpeg(bool(request.get("refresh"))),
+    "ping": _daemon_ping,
+    "metrics": _daemon_metrics,
+    "pin": _daemon_pin,
+    "warmup": lambda request: warmup_model(_daemon_model(request)),
+    "unpin": _daemon_unpin,
+    "configure": _daemon_configure,
+    "stream_start": _daemon_stream_start,
+    "stream_chunk": _daemon_stream_chunk,
+    "stream_decode": _daemon_stream_decode,
+    "stream_end": _daemon_stream_end,
+}
+
+# Request types that use the model and therefore go through the scheduler
+QUEUED_REQUEST_TYPES = {"transcribe", "pin", "warmup", "stream_end", "configure"}
+# Request types that work on model files rather than a loaded model. A
+# download can take minutes, so these run in order on a worker of their own
+# instead of holding up the reader thread or the transcription queue.
+# check and list only stat files and still answer immediately.
+FILE_REQUEST_TYPES = {"download", "delete", "check-ffmpeg"}
+# Request types the daemon queues for itself; clients may not send them,
+# since they would run on the reader thread while the worker uses the model
+INTERNAL_REQUEST_TYPES = {"stream_decode"}
+
+def handle_daemon_request(request):
+    """Dispatch a single daemon request and return its result dictionary"""
+    request_type = request.get("type")
+    handler = DAEMON_HANDLERS.get(request_type)
+    if handler is None:
+        return {"error": f"Unknown request type: {request_type}", "status": 400, "success": False}
+    
+    try:
+        return handler(request)
+    except RequestError as e:
+        # status lets the HTTP front-end answer 4xx instead of 500
+        return {"error": str(e), "status": e.status, "success": False}
+    except Exception as e:
+        return {"error": str(e), "success": False}
+
+# Bitrate assumed for compressed uploads (webm/opus, mp3, ...) when ordering the
+# queue. Deliberately low, so a long recording is never mistaken for a short one.
+COMPRESSED_AUDIO_BYTES_PER_SECOND = 4000
+
+def audio_file_seconds(audio_path):
+    """Duration of an audio file from its WAV header, or a conservative guess from its size"""
+    with open(audio_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            # Mapping the file lets the header parser skip chunks without reading the samples
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                duration = audio_source_info(data).get("duration_s")
+            if duration is not None:
+                return duration
+    return size / COMPRESSED_AUDIO_BYTES_PER_SECOND
+
+def estimate_request_cost(request):
+    """Estimate the audio seconds a request will process, used for queue ordering"""
+    pcm = request.get("pcm")
+    if isinstance(pcm, dict) and isinstance(pcm.get("data"), (bytes, bytearray, memoryview)):
+        try:
+            if pcm.get("format") in PCM_SAMPLE_FORMATS:
+                bytes_per_sample = PCM_SAMPLE_FORMATS[pcm["format"]][1] // 8
+                bytes_per_second = int(pcm.get("sample_rate") or WHISPER_SAMPLE_RATE) * int(pcm.get("channels") or 1) * bytes_per_sample
+                return len(pcm["data"]) / max(bytes_per_second, 1)
+            duration = audio_source_info(pcm=pcm).get("duration_s")
+        except (TypeError, ValueError):
+            # Bad parameters are reported by the request itself
+            duration = None
+        # 16 kHz mono 16-bit PCM is 32000 bytes per second
+        return duration if duration is not None else len(pcm["data"]) / 32000.0
+    
+    audio_path = request.get("audio_path")
+    try:
+        if audio_path and os.path.exists(audio_path):
+            return audio_file_seconds(audio_path)
+    except (OSError, ValueError):
+        pass
+    return 0.0
+
+def metrics_label(request):
+    """Name a request is counted under; transcriptions are split by decoding preset"""
+    request_type = request.get("type")
+    if request_type == "transcribe":
+        return f"transcribe:{request.get('preset') or DEFAULT_DECODING_PRESET}"
+    return request_type
+
+class DaemonMetrics:
+    """Thread-safe request counters and latency totals for serve mode"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests = {}
+    
+    def record(self, request_type, success, queue_ms, processing_ms):
+        with self._lock:
+            stats = self.requests.setdefault(request_type, {
+                "count": 0,
+                "failed": 0,
+                "total_queue_ms": 0.0,
+                "total_processing_ms": 0.0,
+                "max_queue_ms": 0.0
+            })
+            stats["count"] += 1
+            if not success:
+                stats["failed"] += 1
+            stats["total_queue_ms"] += queue_ms
+            stats["total_processing_ms"] += processing_ms
+            stats["max_queue_ms"] = max(stats["max_queue_ms"], queue_ms)
+    
+    def snapshot(self):
+        with self._lock:
+            requests = {}
+            for request_type, stats in self.requests.items():
+                count = stats["count"]
+                requests[request_type] = {
+                    "count": count,
+                    "failed": stats["failed"],
+                    "avg_queue_ms": round(stats["total_queue_ms"] / count, 2),
+                    "max_queue_ms": round(stats["max_queue_ms"], 2),
+                    "avg_processing_ms": round(stats["total_processing_ms"] / count, 2)
+                }
+            return {
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "requests": requests
+            }
+
+class ScheduledJob:
+    """A queued daemon request and its eventual result"""
+    
+    def __init__(self, request, callback=None):
+        self.request = request
+        self.callback = callback
+        self.cost = estimate_request_cost(request)
+        self.submitted_at = time.monotonic()
+        self.result = None
+        self.done = threading.Event()
+    
+    def wait(self, timeout=None):
+        self.done.wait(timeout)
+        return self.result
+
+class TranscriptionScheduler:
+    """Runs model requests one at a time on a dedicated worker thread.
+    
+    The next job is the one with the lowest estimated audio length, minus
+    the time it has already spent waiting (scaled by aging_rate), so short
+    dictations overtake long files without starving them.
+    """
+    
+    def __init__(self, metrics, aging_rate=1.0, name="transcription-worker"):
+        self.metrics = metrics
+        self.aging_rate = aging_rate
+        self._jobs = []
+        self._active = 0
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+    
+    def submit(self, request, callback=None):
+        job = ScheduledJob(request, callback)
+        with self._condition:
+            self._jobs.append(job)
+            self._condition.notify_all()
+        return job
+    
+    def depth(self):
+        with self._condition:
+            return len(self._jobs)
+    
+    def drain(self):
+        """Block until every submitted job has finished"""
+        with self._condition:
+            while self._jobs or self._active:
+                self._condition.wait()
+    
+    def _next_job(self):
+        now = time.monotonic()
+        job = min(self._jobs, key=lambda j: j.cost - (now - j.submitted_at) * self.aging_rate)
+        self._jobs.remove(job)
+        return job
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                job = self._next_job()
+                self._active += 1
+            
+            started_at = time.monotonic()
+            job.result = handle_daemon_request(job.request)
+            finished_at = time.monotonic()
+            self.metrics.record(
+                metrics_label(job.request),
+                job.result.get("success", False),
+                (started_at - job.submitted_at) * 1000,
+                (finished_at - started_at) * 1000
+            )
+            job.done.set()
+            if job.callback:
+                try:
+                    job.callback(job.result)
+                except Exception as e:
+                    print(f"Failed to deliver daemon response: {e}", file=sys.stderr)
+            
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+_daemon_metrics_collector = DaemonMetrics()
+_scheduler = None
+_file_worker = None
+_scheduler_lock = threading.Lock()
+
+def _get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = TranscriptionScheduler(_daemon_metrics_collector)
+        return _scheduler
+
+def _get_file_worker():
+    global _file_worker
+    with _scheduler_lock:
+        if _file_worker is None:
+            # Every file request costs 0, so jobs run in submission order
+            _file_worker = TranscriptionScheduler(_daemon_metrics_collector, name="model-file-worker")
+        return _file_worker
+
+def _queue_for(request_type):
+    """The worker that runs a request type, or None to handle it on the calling thread"""
+    if request_type in QUEUED_REQUEST_TYPES:
+        return _get_scheduler()
+    if request_type in FILE_REQUEST_TYPES:
+        return _get_file_worker()
+    return None
+
+def dispatch_daemon_request(request):
+    """Handle a request synchronously, routing model work through the scheduler"""
+    if request.get("type") in INTERNAL_REQUEST_TYPES:
+        return {"error": f"Unknown request type: {request.get('type')}", "status": 400, "success": False}
+    queue = _queue_for(request.get("type"))
+    if queue is not None:
+        return queue.submit(request).wait()
+    
+    started_at = time.monotonic()
+    result = handle_daemon_request(request)
+    _daemon_metrics_collector.record(
+        metrics_label(request), result.get("success", False), 0.0, (time.monotonic() - started_at) * 1000
+    )
+    return result
+
+# Sessions buffered per performance log write in serve and batch modes (flushed after a few seconds regardless)
+PERF_LOG_BATCH_SIZE = 32
+
+def serve_stdio(input_stream=None, output_stream=None):
+    """Serve newline-delimited JSON requests until EOF or a shutdown request.
+    
+    Every request is a JSON object with a "type" (transcribe, check, list,
+    download, delete, check-ffmpeg, ping, metrics or shutdown) and an
+    optional "id" that is echoed back on the matching response line. Models
+    loaded by earlier requests stay resident in the process between requests.
+    Transcriptions and model file operations (downloads, deletes) are queued on
+    worker threads, so their responses may arrive out of order.
+    """
+    input_stream = input_stream or sys.stdin.buffer
+    output_stream = output_stream or sys.stdout
+    output_lock = threading.Lock()
+    
+    # Only protocol responses may reach the real stdout; anything else that
+    # prints (libraries, progress output) is diverted to stderr.
+    previous_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    
+    def respond(response):
+        with output_lock:
+            output_stream.write(json.dumps(response) + "\n")
+            output_stream.flush()
+    
+    scheduler = _get_scheduler()
+    file_worker = _get_file_worker()
+    try:
+        respond({"type": "ready", "pid": os.getpid(), "success": True})
+        
+        for raw_line in iter(input_stream.readline, b""):
+            line = raw_line.strip()
+            if not line:
+                continue
+            
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                respond({"id": None, "error": f"Invalid JSON request: {e}", "success": False})
+                continue
+            
+            if not isinstance(request, dict):
+                respond({"id": None, "error": "Request must be a JSON object", "success": False})
+                continue
+            
+            request_id = request.get("id")
+            request_type = request.get("type")
+            
+            # Inline audio follows the request line as exactly pcm.bytes raw bytes
+            pcm = request.get("pcm")
+            if isinstance(pcm, dict) and "bytes" in pcm:
+                try:
+                    pcm["data"] = read_exact(input_stream, int(pcm["bytes"]))
+                except (EOFError, ValueError) as e:
+                    respond({"id": request_id, "type": request_type, "error": str(e), "success": False})
+                    break
+            
+            if request_type == "stream_start":
+                # Partials are pushed as events tagged with the stream_start request id
+                request["on_partial"] = lambda event, request_id=request_id: respond({"id": request_id, **event})
+            
+            if request_type == "shutdown":
+                scheduler.drain()
+                file_worker.drain()
+                respond({"id": request_id, "type": "shutdown", "success": True})
+                break
+            
+            queue = _queue_for(request_type)
+            if queue is not None:
+                queue.submit(
+                    request,
+                    lambda result, request_id=request_id, request_type=request_type:
+                        respond({"id": request_id, "type": request_type, **result})
+                )
+                continue
+            
+            result = dispatch_daemon_request(request)
+            respond({"id": request_id, "type": request_type, **result})
+        
+        scheduler.drain()
+        file_worker.drain()
+    finally:
+        sys.stdout = previous_stdout
+
+class BridgeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """HTTP front-end for serve mode.
+    
+    GET  /health          - process liveness and loaded models
+    GET  /metrics         - request counters, latencies and queue depth
+    GET  /models          - download status of every model
+    GET  /models/<name>   - download status of one model
+    POST /transcribe      - JSON body with audio_path, model and language, or
+                            raw audio with ?format=s16le|f32le|wav&sample_rate=...
+                            &channels=...&model=...&language=...
+    """
+    
+    server_version = "OpenWhisprBridge/1.0"
+    
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            self._dispatch({"type": "ping"})
+        elif path == "/metrics":
+            self._dispatch({"type": "metrics"})
+        elif path == "/models":
+            self._dispatch({"type": "list"})
+        elif path.startswith("/models/"):
+            self._dispatch({"type": "check", "model": path[len("/models/"):]})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {path}", "success": False})
+    
+    def do_POST(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path != "/transcribe":
+            self._send_json(404, {"error": f"Unknown endpoint: {path}", "success": False})
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip()
+            if content_type in ("", "application/json"):
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("Request body must be a JSON object")
+            else:
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+                params = {key: values[-1] for key, values in query.items()}
+                request = {
+                    "model": params.get("model"),
+                    "language": params.get("language"),
+                    "preset": params.get("preset"),
+                    "pcm": {
+                        "format": params.get("format") or "wav",
+                        "sample_rate": params.get("sample_rate"),
+                        "channels": params.get("channels"),
+                        "data": read_exact(self.rfile, length)
+                    }
+                }
+        except (ValueError, EOFError) as e:
+            self._send_json(400, {"error": f"Invalid request body: {e}", "success": False})
+            return
+        
+        request["type"] = "transcribe"
+        self._dispatch(request)
+    
+    def _dispatch(self, request):
+        result = dispatch_daemon_request(request)
+        self._send_json(result.get("status") or (200 if result.get("success") else 500), result)
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix-socket"
+    
+    def log_message(self, format, *args):
+        print(f"[bridge-http] {self.address_string()} {format % args}", file=sys.stderr)
+
+# Unix domain sockets are unavailable on some platforms (e.g. older Windows builds)
+if hasattr(socketserver, "UnixStreamServer"):
+    class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        
+        def server_bind(self):
+            socketserver.UnixStreamServer.server_bind(self)
+            # Unix sockets carry no host/port for BaseHTTPRequestHandler to report
+            self.server_name = "localhost"
+            self.server_port = 0
+else:
+    ThreadingUnixHTTPServer = None
+
+def serve_http(port=None, socket_path=None):
+    """Serve the HTTP front-end on 127.0.0.1:<port> or a Unix domain socket"""
+    if socket_path:
+        if ThreadingUnixHTTPServer is None:
+            print(json.dumps({"error": "Unix domain sockets are not supported on this platform", "success": False}))
+            sys.exit(1)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, BridgeRequestHandler)
+        os.chmod(socket_path, 0o600)
+        address = socket_path
+    else:
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), BridgeRequestHandler)
+        server.daemon_threads = True
+        address = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    sys.stdout = sys.stderr
+    
+    # Exit through the finally block below so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    _get_scheduler()
+    print(f"Whisper bridge listening on {address}", file=sys.stderr)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
 def main():
     parser = argparse.ArgumentParser(description="Whisper Bridge for OpenWhispr")
     parser.add_argument("--mode", default="transcribe", 
-                       choices=["transcribe", "download", "check", "list", "delete", "check-ffmpeg"],
+                       choices=["transcribe", "download", "check", "list", "delete", "check-ffmpeg", "serve", "warmup", "stream",
+                                "batch"],
                        help="Operation mode (default: transcribe)")
-    parser.add_argument("audio_file", nargs="?", help="Path to audio file to transcribe")
+    parser.add_argument("audio_files", nargs="*", metavar="audio_file",
+                       help="Path to audio file to transcribe (batch mode: any number of files or directories)")
     parser.add_argument("--model", default="base", 
-                       choices=["tiny", "base", "small", "medium", "large", "turbo"],
+                       choices=AVAILABLE_MODELS,
                        help="Whisper model to use (default: base)")
     parser.add_argument("--language", help="Language code (optional)")
     parser.add_argument("--output-format", default="json", 
                        choices=["json", "text"],
                        help="Output format (default: json)")
+    parser.add_argument("--workers", type=int, default=1,
+                       help=f"Worker processes for audio longer than {LONG_AUDIO_MIN_SECONDS}s, "
+                            "or for files in batch mode (default: 1)")
+    parser.add_argument("--manifest",
+                       help="Batch mode: text file listing audio paths, one per line")
+    parser.add_argument("--output",
+                       help="Batch mode: JSON Lines file to append results to; files already "
+                            "transcribed successfully in it are skipped")
+    parser.add_argument("--preset", default=DEFAULT_DECODING_PRESET, choices=list(DECODING_PRESETS),
+                       help="Local decoding strategy: fast (single greedy pass), balanced (Whisper defaults) "
+                            f"or accurate (beam search) (default: {DEFAULT_DECODING_PRESET})")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Do not read or write the transcription result cache")
+    parser.add_argument("--no-vad", action="store_true",
+                       help="Do not trim silence before local transcription")
+    parser.add_argument("--stdin-pcm", action="store_true",
+                       help="Transcribe mode: read audio from stdin as one JSON header line "
+                            '(e.g. {"format": "s16le", "sample_rate": 16000, "channels": 1}) '
+                            "followed by the raw bytes")
+    parser.add_argument("--refresh", action="store_true",
+                       help="Check-ffmpeg mode: search for FFmpeg again instead of using the saved result")
+    parser.add_argument("--port", type=int,
+                       help="Serve mode: listen for HTTP on 127.0.0.1:<port> instead of stdin/stdout")
+    parser.add_argument("--socket",
+                       help="Serve mode: listen for HTTP on this Unix domain socket instead of stdin/stdout")
+    parser.add_argument("--backend", choices=list(BACKENDS),
+                       help="Local inference engine (default: pytorch, or OPENWHISPR_BACKEND)")
+    parser.add_argument("--compute-type",
+                       help="Weight precision for the backend, e.g. float16 for pytorch or int8 for "
+                            "faster-whisper (default: float32 for pytorch, int8 on CPU for faster-whisper)")
+    parser.add_argument("--quantize", choices=["int8"],
+                       help="Apply dynamic int8 quantization to the model's Linear layers (CPU only; "
+                            "same as --compute-type int8). The quantized model is cached next to the Whisper cache")
+    parser.add_argument("--threads", type=int,
+                       help="Intra-op CPU threads for inference (default: library default, usually all cores)")
+    parser.add_argument("--interop-threads", type=int,
+                       help="Inter-op CPU threads for the PyTorch backend")
+    parser.add_argument("--cpu-affinity",
+                       help='Restrict the bridge to these CPUs, e.g. "0-3,6" (Linux only)')
+    parser.add_argument("--cache-budget-mb", type=int,
+                       help=f"Memory budget for resident models in MB (default: {DEFAULT_MODEL_CACHE_MB}, "
+                            "or OPENWHISPR_MODEL_CACHE_MB)")
     
     args = parser.parse_args()
+    args.audio_file = args.audio_files[0] if args.audio_files else None
+    
+    if args.cache_budget_mb is not None:
+        _model_cache.set_budget(args.cache_budget_mb * 1024 * 1024)
+    
+    if args.threads is not None or args.interop_threads is not None or args.cpu_affinity:
+        try:
+            configure_threads(args.threads, args.interop_threads,
+                              parse_cpu_list(args.cpu_affinity) if args.cpu_affinity else None)
+        except (ValueError, OSError) as e:
+            print(json.dumps({"error": f"Invalid thread settings: {e}", "success": False}))
+            sys.exit(1)
+    
+    if args.backend or args.compute_type or args.quantize:
+        try:
+            if args.quantize and args.compute_type and args.compute_type != args.quantize:
+                raise ValueError(f"--quantize {args.quantize} conflicts with --compute-type {args.compute_type}")
+            set_default_backend(args.backend or _default_backend, args.compute_type or args.quantize)
+        except ValueError as e:
+            print(json.dumps({"error": str(e), "success": False}))
+            sys.exit(1)
     
     # Handle different modes
     if args.mode == "download":
@@ -604,9 +3533,65 @@ def main():
         print(json.dumps(result))
         return
     elif args.mode == "check-ffmpeg":
-        result = check_ffmpeg()
+        result = check_ffmpeg(args.refresh)
+        print(json.dumps(result))
+        return
+    elif args.mode == "warmup":
+        result = warmup_model(args.model)
+        print(json.dumps(result))
+        return
+    elif args.mode == "stream":
+        try:
+            result = transcribe_stream(sys.stdin.buffer, args.model, args.language)
+        except ValueError as e:
+            result = {"error": f"Invalid stream input: {e}", "success": False}
+        print(json.dumps(result))
+        if not result.get("success"):
+            sys.exit(1)
+        return
+    elif args.mode == "batch":
+        try:
+            audio_files = collect_batch_files(args.audio_files, args.manifest)
+        except OSError as e:
+            print(json.dumps({"error": f"Cannot read manifest: {e}", "success": False}))
+            sys.exit(1)
+        if not audio_files:
+            print(json.dumps({"error": "No audio files given for batch mode", "success": False}))
+            sys.exit(1)
+        
+        # Long runs append performance sessions in groups rather than one write each
+        from performance_logger import configure_log_writers
+        configure_log_writers(batch_size=PERF_LOG_BATCH_SIZE)
+        
+        result = transcribe_batch(audio_files, args.model, args.language, output_path=args.output,
+                                  workers=args.workers, vad=not args.no_vad, use_cache=not args.no_cache,
+                                  preset=args.preset)
         print(json.dumps(result))
         return
+    elif args.mode == "serve":
+        from performance_logger import configure_log_writers
+        configure_log_writers(batch_size=PERF_LOG_BATCH_SIZE)
+        if args.socket or args.port is not None:
+            serve_http(port=args.port, socket_path=args.socket)
+        else:
+            serve_stdio()
+        return
+    elif args.mode == "transcribe" and args.stdin_pcm:
+        try:
+            pcm = json.loads(sys.stdin.buffer.readline())
+            if not isinstance(pcm, dict):
+                raise ValueError("PCM header must be a JSON object")
+            if "bytes" in pcm:
+                pcm["data"] = read_exact(sys.stdin.buffer, int(pcm["bytes"]))
+            else:
+                pcm["data"] = bytearray(sys.stdin.buffer.read())
+        except (ValueError, EOFError) as e:
+            print(json.dumps({"error": f"Invalid PCM input: {e}", "success": False}))
+            sys.exit(1)
+        
+        result = transcribe_audio("<stdin>", args.model, args.language, pcm=pcm, vad=not args.no_vad,
+                                  workers=args.workers, use_cache=not args.no_cache, preset=args.preset)
+        print(json.dumps(result))
     elif args.mode == "transcribe":
         # Check if audio file exists
         if not args.audio_file:
@@ -620,7 +3605,8 @@ def main():
             sys.exit(1)
         
         # Transcribe
-        result = transcribe_audio(args.audio_file, args.model, args.language)
+        result = transcribe_audio(args.audio_file, args.model, args.language, vad=not args.no_vad,
+                                  workers=args.workers, use_cache=not args.no_cache, preset=args.preset)
         
         # Output results
         if args.output_format == "json":